@@ -23,6 +23,7 @@ from manim_lamination_builder.custom_json import (
 )
 from manim_lamination_builder.lamination import (
     AgnosticLamination,
+    ColumnarLamination,
     GapLamination,
     LeafLamination,
     Polygon,
@@ -34,9 +35,18 @@ from manim_lamination_builder.morph import (
     OccludedLamination,
     interpolate_quotent_of_region_of_rotational_polygon,
 )
-from manim_lamination_builder.new_generate import next_pull_back
+from manim_lamination_builder.new_generate import iter_pull_backs, next_pull_back
 from manim_lamination_builder.orbits import PeriodicOrbit
-from manim_lamination_builder.points import Angle, FloatWrapper, NaryFraction, sigma
+from manim_lamination_builder.points import (
+    Angle,
+    AngleArray,
+    FloatWrapper,
+    NaryFraction,
+    Orbit,
+    in_forward_orbit,
+    orbit,
+    sigma,
+)
 from manim_lamination_builder.pull_back_tree import PullBackTree, TreeRender
 from manim_lamination_builder.pull_backs import FDL, CriticalTree, rabbit_nth_pullback
 from manim_lamination_builder.sibling_trees import (
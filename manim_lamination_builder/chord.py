@@ -4,8 +4,11 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
+import bisect
 from math import pi, tan
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 from manim import BLACK, TAU, Mobject, VMobject
 from pydantic import BaseModel
 
@@ -18,7 +21,7 @@ class Chord(BaseModel):
 
     def __init__(self, a: Angle, b: Angle):
         min, max = b, a
-        if a.to_float() < b.to_float():
+        if a.sort_key < b.sort_key:
             min, max = max, min
         super(Chord, self).__init__(min=min, max=max)
 
@@ -28,20 +31,11 @@ class Chord(BaseModel):
     def crosses(self, other: "Chord") -> bool:
         if other == self:
             return False
-        if (
-            self.max.to_float() <= other.min.to_float()
-            or self.min.to_float() >= other.max.to_float()
-        ):
+        a, b = self.min.sort_key, self.max.sort_key
+        c, d = other.min.sort_key, other.max.sort_key
+        if b <= c or a >= d:
             return False
-        if (
-            self.min.to_float() > other.min.to_float()
-            and self.max.to_float() > other.max.to_float()
-        ) or (
-            self.min.to_float() < other.min.to_float()
-            and self.max.to_float() < other.max.to_float()
-        ):
-            return True
-        return False
+        return (a > c and b > d) or (a < c and b < d)
 
     def length(self) -> float:
         "length in rotations"
@@ -70,6 +64,163 @@ class Chord(BaseModel):
         return Chord(self.min.after_sigma(), self.max.after_sigma())
 
 
+def first_crossing(chords: Iterable[Chord]) -> Optional[Tuple[Chord, Chord]]:
+    """A pair of chords that cross, if there is one. Sweeping the endpoints in
+    order, chords that don't cross open and close like nested parentheses, so it is
+    enough to check that each chord is the most recently opened one still open when
+    it closes. O(n log n)"""
+    # degenerate chords cross nothing, and equal chords don't cross each other
+    chords = [c for c in dict.fromkeys(chords) if c.min.sort_key != c.max.sort_key]
+    # at a common endpoint: chords close before others open, the inner ones first
+    opening = sorted(
+        sorted(chords, key=lambda c: c.max.sort_key, reverse=True),
+        key=lambda c: c.min.sort_key,
+    )
+    closing = sorted(
+        sorted(chords, key=lambda c: c.min.sort_key, reverse=True),
+        key=lambda c: c.max.sort_key,
+    )
+    stack = []
+    i = 0
+    for chord in closing:
+        end = chord.max.sort_key
+        while i < len(opening) and opening[i].min.sort_key < end:
+            stack.append(opening[i])
+            i += 1
+        innermost = stack.pop()
+        if innermost is not chord:
+            return chord, innermost
+    return None
+
+
+class CrossingIndex:
+    """The endpoints of a set of chords in circular order, each with the other ends
+    of the chords there, for asking whether a new chord crosses any of them. While
+    the indexed chords are unlinked, a query steps over each chord nested inside
+    the new one (and everything under it) at once, so it costs O(log n) per chord
+    directly below the new one. Insertion is incremental."""
+
+    def __init__(self, chords: Iterable[Chord] = ()):
+        chords = list(chords)
+        self.count = len(chords)
+        partners: Dict[tuple, List[tuple]] = {}
+        for chord in chords:
+            a, b = chord.min.sort_key, chord.max.sort_key
+            if a != b:
+                partners.setdefault(a, []).append(b)
+                partners.setdefault(b, []).append(a)
+        self._keys = sorted(partners)
+        self._partners = [partners[key] for key in self._keys]
+        self.unlinked = first_crossing(chords) is None
+
+    def crosses(self, chord: Chord) -> bool:
+        a, b = chord.min.sort_key, chord.max.sort_key
+        keys, partners = self._keys, self._partners
+        i = bisect.bisect_right(keys, a)
+        end = bisect.bisect_left(keys, b)
+        while i < end:
+            key = keys[i]
+            farthest = None
+            for other in partners[i]:
+                if other < a or other > b:
+                    return True
+                if key < other < b and (farthest is None or other > farthest):
+                    farthest = other
+            if self.unlinked and farthest is not None:
+                # nothing under an unlinked chord can reach outside of it
+                i = bisect.bisect_left(keys, farthest, i + 1, end)
+            else:
+                i += 1
+        return False
+
+    def add(self, chord: Chord):
+        self.count += 1
+        a, b = chord.min.sort_key, chord.max.sort_key
+        if a == b:
+            return
+        if self.unlinked and self.crosses(chord):
+            self.unlinked = False
+        for key, other in [(a, b), (b, a)]:
+            i = bisect.bisect_left(self._keys, key)
+            if i < len(self._keys) and self._keys[i] == key:
+                self._partners[i].append(other)
+            else:
+                self._keys.insert(i, key)
+                self._partners.insert(i, [other])
+
+    def remove(self, chord: Chord, unlinked: bool):
+        "undoes add(chord), given whether the chords were unlinked before it"
+        self.count -= 1
+        self.unlinked = unlinked
+        a, b = chord.min.sort_key, chord.max.sort_key
+        if a == b:
+            return
+        for key, other in [(a, b), (b, a)]:
+            i = bisect.bisect_left(self._keys, key)
+            partners = self._partners[i]
+            partners.remove(other)
+            if len(partners) == 0:
+                del self._keys[i]
+                del self._partners[i]
+
+    def copy(self) -> "CrossingIndex":
+        ret = CrossingIndex.__new__(CrossingIndex)
+        ret.count = self.count
+        ret._keys = self._keys.copy()
+        ret._partners = [partners.copy() for partners in self._partners]
+        ret.unlinked = self.unlinked
+        return ret
+
+
+def chord_endpoints(chords: Iterable[Chord]) -> np.ndarray:
+    "an (n, 2) array of the (min, max) of each chord as floats"
+    return np.array(
+        [(chord.min.to_float(), chord.max.to_float()) for chord in chords],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+
+
+def _crossing_block(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    a_min, a_max = a.min(axis=1)[:, None], a.max(axis=1)[:, None]
+    b_min, b_max = b.min(axis=1)[None, :], b.max(axis=1)[None, :]
+    # strictly interleaved, as in Chord.crosses
+    return ((a_min < b_min) & (b_min < a_max) & (a_max < b_max)) | (
+        (b_min < a_min) & (a_min < b_max) & (b_max < a_max)
+    )
+
+
+def crossing_matrix(
+    a: np.ndarray, b: np.ndarray, chunk_size: Optional[int] = None
+) -> np.ndarray:
+    """Given arrays of shape (n, 2) and (m, 2) holding the endpoints of chords (in
+    either order), the (n, m) boolean matrix of which pairs cross. With a
+    chunk_size, only that many rows are compared at once, which bounds the
+    temporaries to chunk_size * m."""
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    if chunk_size is None:
+        return _crossing_block(a, b)
+    ret = np.empty((len(a), len(b)), dtype=bool)
+    for start in range(0, len(a), chunk_size):
+        ret[start : start + chunk_size] = _crossing_block(
+            a[start : start + chunk_size], b
+        )
+    return ret
+
+
+def crossing_counts(
+    a: np.ndarray, b: np.ndarray, chunk_size: int = 1 << 10
+) -> np.ndarray:
+    """for each chord of a, how many chords of b it crosses. Memory is bounded by
+    chunk_size * len(b)"""
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    ret = np.zeros(len(a), dtype=np.int64)
+    for start in range(0, len(a), chunk_size):
+        ret[start : start + chunk_size] = _crossing_block(
+            a[start : start + chunk_size], b
+        ).sum(axis=1)
+    return ret
+
+
 def make_and_append_bezier(vmob: VMobject, theta1: Angle, theta2: Angle):
     """Add a cubic Bezier curve to a VMobject using given angles or NaryFractions."""
 
@@ -1,6 +1,5 @@
 import colorsys
 import math
-from copy import deepcopy
 from operator import xor
 from typing import Callable, Iterable, List
 
@@ -13,7 +12,6 @@ from manim_lamination_builder.lamination import AbstractLamination, LeafLaminati
 from manim_lamination_builder.main import Main
 from manim_lamination_builder.malaugh import Psi, psi
 from manim_lamination_builder.points import Angle, FloatWrapper, NaryFraction, sigma
-from manim_lamination_builder.visual_settings import VisualSettings
 
 
 def angle_to_color(angle_rotations: Angle):
@@ -50,14 +48,14 @@ class ColorWheel(Scene):
 
 
 def color(v: Iterable[Angle]) -> List[Angle]:
-    v = list(v)
+    "returns restyled copies, since the points may be shared (NaryFraction.interned)"
+    ret = []
     for p in v:
         color = angle_to_color(p)
-        settings = VisualSettings(
-            point_color=color, stroke_color=color, polygon_color=color
+        ret.append(
+            p.restyled(point_color=color, stroke_color=color, polygon_color=color)
         )
-        p.visual_settings = settings
-    return v
+    return ret
 
 
 class GenerateLams(Scene):
@@ -291,9 +289,9 @@ def long_minors(insertion_points: List[Angle]) -> LeafLamination:
 
 def color_periodic(lam: AbstractLamination) -> AbstractLamination:
     def f(x: Angle):
-        ret = deepcopy(x.to_nary_fraction())
+        ret = x.to_nary_fraction()
         if x.periodic():
-            ret.visual_settings.stroke_color = RED
+            ret = ret.restyled(stroke_color=RED)
         return ret
 
     return lam.apply_function(f)
@@ -365,12 +363,9 @@ if __name__ == "__main__":
         # proposed model
         third = NaryFraction.from_string(4, "_1")
         twothirds = NaryFraction.from_string(4, "_2")
-        for p in reduced:
-            p.visual_settings.stroke_color = RED
+        reduced = [p.restyled(stroke_color=RED) for p in reduced]
         lam = long_minors(reduced)
-        points = periodic_points(9)
-        for p in points:
-            p.visual_settings.stroke_color = ORANGE
+        points = [p.restyled(stroke_color=ORANGE) for p in periodic_points(9)]
         lam.leafs.update(short_minors(points).leafs)
         lam = lam.filtered(lambda x: x not in [third, twothirds])
         lam.leafs.update([Chord(third, twothirds)])
@@ -391,12 +386,9 @@ if __name__ == "__main__":
     ):
         third = NaryFraction.from_string(4, "_1")
         twothirds = NaryFraction.from_string(4, "_2")
-        for p in reduced:
-            p.visual_settings.stroke_color = RED
+        reduced = [p.restyled(stroke_color=RED) for p in reduced]
         lam = long_minors(reduced)
-        points = periodic_points(9)
-        for p in points:
-            p.visual_settings.stroke_color = ORANGE
+        points = [p.restyled(stroke_color=ORANGE) for p in periodic_points(9)]
         lam.leafs.update(short_minors(points).leafs)
         lam = lam.filtered(lambda x: x not in [third, twothirds])
         lam.leafs.update([Chord(third, twothirds)])
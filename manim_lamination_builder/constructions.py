@@ -15,14 +15,12 @@ from manim_lamination_builder.lamination import (
     sigma,
 )
 from manim_lamination_builder.points import Angle, NaryFraction
-from manim_lamination_builder.visual_settings import VisualSettings, get_color
+from manim_lamination_builder.visual_settings import get_color
 
 
 def uniquely_color(list: Polygon) -> Polygon:
-    "mutates and returns mutation"
-    for i, p in enumerate(list):
-        p.visual_settings = VisualSettings(point_color=get_color(i))
-    return list
+    "returns restyled copies, since the points may be shared (NaryFraction.interned)"
+    return tuple(p.restyled(point_color=get_color(i)) for i, p in enumerate(list))
 
 
 def unicritical_polygon(d, q) -> tuple[NaryFraction, ...]:
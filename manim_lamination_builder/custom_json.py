@@ -29,7 +29,7 @@ class CustomEncoder(json.JSONEncoder):
             return v.value
         if vtype in types:
             return types[type(v).__name__](v)
-        if vtype == "set":
+        if isinstance(v, set):
             return list(v)
         else:
             return json.JSONEncoder.default(self, v)
@@ -4,18 +4,43 @@
 
 
 import bisect
+import hashlib
 from abc import ABC, abstractmethod
-from itertools import combinations
-from typing import Callable, Generic, List, Sequence, Set, TypeVar, Union
-
+from fractions import Fraction
+from functools import wraps
+from itertools import chain
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import numpy as np
 from manim import BLACK, ORIGIN, WHITE, Circle, Dot, Mobject, VMobject, config
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, PrivateAttr, field_validator
 
-from manim_lamination_builder.chord import Chord, make_and_append_bezier
-from manim_lamination_builder.points import Angle, Degree, sigma
+from manim_lamination_builder.chord import (
+    Chord,
+    CrossingIndex,
+    first_crossing,
+    make_and_append_bezier,
+)
+from manim_lamination_builder.points import Angle, AngleArray, Degree, sigma
 
 background = BLACK
 
+# when set, GapLamination._trusted checks that its polygons are already canonical
+CHECK_TRUSTED_POLYGONS = False
+
 
 T = TypeVar("T", bound="AbstractLamination")
 
@@ -67,11 +92,133 @@ Polygon = tuple[
 ]  # TODO: add validator to test if this is in order as needed.
 
 
+def _renewing(*names: str):
+    "makes the named methods of a tracked collection renew its version"
+
+    def renewed(method):
+        @wraps(method)
+        def call(self, *args, **kwargs):
+            ret = method(self, *args, **kwargs)
+            self.version += 1
+            return ret
+
+        return call
+
+    def decorate(cls):
+        for name in names:
+            setattr(cls, name, renewed(getattr(cls, name)))
+        return cls
+
+    return decorate
+
+
+@_renewing(
+    "add",
+    "discard",
+    "remove",
+    "pop",
+    "clear",
+    "update",
+    "difference_update",
+    "intersection_update",
+    "symmetric_difference_update",
+    "__ior__",
+    "__iand__",
+    "__isub__",
+    "__ixor__",
+)
+class _TrackedSet(set):
+    "a set with a version that every change to it renews, for keying caches on"
+
+    version = 0
+
+
+@_renewing(
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+)
+class _TrackedList(list):
+    "a list with a version that every change to it renews, for keying caches on"
+
+    version = 0
+
+
+def _stamped(collection, value) -> Optional[tuple]:
+    """a cache of value for collection as it is now, or None if collection is not
+    tracked (so changes to it could not be seen)"""
+    version = getattr(collection, "version", None)
+    if version is None:
+        return None
+    return collection, version, value
+
+
+def _cached(stamped: Optional[tuple], collection):
+    "the value of a cache made by _stamped, if collection has not changed since"
+    if (
+        stamped is not None
+        and stamped[0] is collection
+        and stamped[1] == collection.version
+    ):
+        return stamped[2]
+    return None
+
+
+class _VertexIndex:
+    "the vertices of a GapLamination in CCW order, and the polygon of each"
+
+    def __init__(self, polygons: List[Polygon]):
+        self.polygon_index: Dict[Angle, int] = {}
+        for i, polygon in enumerate(polygons):
+            for vertex in polygon:
+                self.polygon_index.setdefault(vertex, i)
+        self.vertices = sorted(self.polygon_index, key=lambda p: p.sort_key)
+        self.keys = [vertex.sort_key for vertex in self.vertices]
+
+
+def _fingerprint(kind: str, degree: Degree, groups: Iterable[Iterable[Angle]]) -> bytes:
+    """a 128 bit digest of groups of angles (polygons or leaves) by their exact
+    values, which does not depend on the order of the groups or within them"""
+    canonical = sorted(
+        tuple(sorted(Fraction(angle.sort_key[1]) for angle in group))
+        for group in groups
+    )
+    text = ";".join(",".join(map(str, group)) for group in canonical)
+    return hashlib.blake2b(
+        "{}:{}:{}".format(kind, degree, text).encode(), digest_size=16
+    ).digest()
+
+
 class GapLamination(BaseModel, AbstractLamination):
+    """Polygons (gaps) of angles. Two GapLaminations are equal, and hash alike, when
+    they have the same degree and the same polygons, in any order: the points and
+    the visual settings are not compared."""
+
     points: List[Angle]
     degree: Degree
     # dark_theme: bool = True
     polygons: List[Polygon]
+    # stamped for the polygons it was built for
+    _vertex_index: Optional[Tuple[List[Polygon], int, _VertexIndex]] = PrivateAttr(
+        default=None
+    )
+    # stamped for the polygons it was computed for, with the degree
+    _fingerprint: Optional[Tuple[List[Polygon], int, Tuple[Degree, bytes]]] = (
+        PrivateAttr(default=None)
+    )
+    # stamped for the polygons it was computed for
+    _trapped_criticality: Optional[Tuple[List[Polygon], int, int]] = PrivateAttr(
+        default=None
+    )
 
     @field_validator("polygons")
     @classmethod
@@ -79,10 +226,8 @@ class GapLamination(BaseModel, AbstractLamination):
         sorted_polygons = []
         for polygon in polygons:
             if len(polygon) > 1:
-                sorted_polygons.append(
-                    tuple(sorted(polygon, key=lambda a: a.to_float()))
-                )
-        return sorted_polygons
+                sorted_polygons.append(tuple(sorted(polygon, key=lambda a: a.sort_key)))
+        return _TrackedList(sorted_polygons)
 
     def __init__(  # TODO: check if I still need this / switch to tuple only.
         self,
@@ -99,12 +244,86 @@ class GapLamination(BaseModel, AbstractLamination):
             degree=degree,  # , dark_theme=dark_theme
         )
 
+    @staticmethod
+    def _trusted(
+        polygons: List[Polygon], points: List[Angle], degree: Degree
+    ) -> "GapLamination":
+        """construction without validation from polygons that are already sorted and
+        non-degenerate, such as those of other GapLaminations"""
+        if CHECK_TRUSTED_POLYGONS:
+            assert polygons == GapLamination._check_polygons_order(
+                polygons
+            ), "polygons are not canonical"
+        return GapLamination.model_construct(
+            polygons=_TrackedList(polygons), points=points, degree=degree
+        )
+
+    @staticmethod
+    def _joined(parts: Sequence["GapLamination"], degree: Degree) -> "GapLamination":
+        """the trusted lamination with the polygons of all the parts, whose trapped
+        criticality is the sum of theirs"""
+        ret = GapLamination._trusted(
+            list(chain.from_iterable(part.polygons for part in parts)), [], degree
+        )
+        ret._trapped_criticality = _stamped(
+            ret.polygons, sum(part.trapped_criticality() for part in parts)
+        )
+        return ret
+
+    def _index(self) -> _VertexIndex:
+        index = _cached(self._vertex_index, self.polygons)
+        if index is None:
+            # (re)built if polygons were changed since
+            index = _VertexIndex(self.polygons)
+            self._vertex_index = _stamped(self.polygons, index)
+        return index
+
+    def fingerprint(self) -> bytes:
+        "a digest of the degree and the polygons, independent of their order"
+        cached = _cached(self._fingerprint, self.polygons)
+        if cached is None or cached[0] != self.degree:
+            cached = (self.degree, _fingerprint("gaps", self.degree, self.polygons))
+            self._fingerprint = _stamped(self.polygons, cached)
+        return cached[1]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GapLamination):
+            return NotImplemented
+        return self.fingerprint() == other.fingerprint()
+
+    def __hash__(self) -> int:
+        return hash(self.fingerprint())
+
+    def polygon_of(self, angle: Angle) -> Optional[Polygon]:
+        "the polygon with angle as a vertex, if there is one"
+        i = self._index().polygon_index.get(angle)
+        if i is None:
+            return None
+        return self.polygons[i]
+
+    def contains(self, angle: Angle) -> bool:
+        "whether angle is a vertex of one of the polygons"
+        return self.polygon_of(angle) is not None
+
+    def next_vertex(self, angle: Angle) -> Angle:
+        "the first vertex of any polygon CCW from angle (excluding angle itself)"
+        index = self._index()
+        assert len(index.vertices) > 0, "there are no vertices"
+        i = bisect.bisect_right(index.keys, angle.sort_key)
+        for j in range(i, i + len(index.vertices)):
+            vertex = index.vertices[j % len(index.vertices)]
+            if vertex != angle:
+                return vertex
+        return index.vertices[i % len(index.vertices)]
+
     def auto_populated(self) -> "GapLamination":
         new_points = self.points.copy()
+        known = set(self.points)
         for polygon in self.polygons:
             for point in polygon:
-                if point not in self.points:
+                if point not in known:
                     new_points.append(point)
+                    known.add(point)
         return GapLamination(
             polygons=self.polygons,  # type: ignore
             points=new_points,
@@ -190,14 +409,16 @@ class GapLamination(BaseModel, AbstractLamination):
         def degree(p: Polygon) -> int:
             return int(len(p) / len(set(sigma(p))))
 
-        return sum([degree(p) - 1 for p in self.polygons])
+        value = _cached(self._trapped_criticality, self.polygons)
+        if value is None:
+            value = sum([degree(p) - 1 for p in self.polygons])
+            self._trapped_criticality = _stamped(self.polygons, value)
+        return value
 
     def finer(self, other: "GapLamination") -> bool:
         "return wether self is finer than other"
         for poly in self.polygons:
-            parent = next(
-                filter(lambda parent: poly[0] in parent, other.polygons), None
-            )
+            parent = other.polygon_of(poly[0])
             if parent is None:
                 return False
             for theta in poly:
@@ -213,27 +434,30 @@ class GapLamination(BaseModel, AbstractLamination):
     @staticmethod
     def polygons_unlinked(a: Polygon, b: Polygon) -> bool:
         assert len(set(a).intersection(set(b))) == 0
-        if a[-1].to_float() < b[0].to_float() or b[-1].to_float() < a[0].to_float():
+        if a[-1].sort_key < b[0].sort_key or b[-1].sort_key < a[0].sort_key:
             return True
         return (
-            b[-1].to_float()
-            < a[
-                bisect.bisect_left(a, b[0].to_float(), key=lambda p: p.to_float())
-            ].to_float()
-            or a[-1].to_float()
-            < b[
-                bisect.bisect_left(b, a[0].to_float(), key=lambda p: p.to_float())
-            ].to_float()
+            b[-1].sort_key
+            < a[bisect.bisect_left(a, b[0].sort_key, key=lambda p: p.sort_key)].sort_key
+            or a[-1].sort_key
+            < b[bisect.bisect_left(b, a[0].sort_key, key=lambda p: p.sort_key)].sort_key
         )
 
     def unlinked(self) -> bool:
-        "Checks the pairwise intersections to see if the set is unlinked"
-        for i, j in combinations(range(len(self.polygons)), 2):
-            if not GapLamination.polygons_unlinked(
-                list(self.polygons)[i], list(self.polygons)[j]
-            ):
-                return False
-        return True
+        "Checks if any two polygons are linked, that is if any of their edges cross"
+        return self.first_crossing() is None
+
+    def first_crossing(self) -> Optional[Tuple[Polygon, Polygon]]:
+        "a pair of linked polygons, if there is one"
+        polygon_of_edge = {}
+        for polygon in self.polygons:
+            for i in range(len(polygon)):
+                edge = Chord(polygon[i], polygon[(i + 1) % len(polygon)])
+                polygon_of_edge[edge] = polygon
+        pair = first_crossing(polygon_of_edge.keys())
+        if pair is None:
+            return None
+        return polygon_of_edge[pair[0]], polygon_of_edge[pair[1]]
 
     def coexists(self, other: "GapLamination") -> bool:
         "Checks weather any class of the first crosses a class of the latter"
@@ -250,62 +474,152 @@ class GapLamination(BaseModel, AbstractLamination):
 
 
 class LeafLamination(BaseModel, AbstractLamination):
+    """Leafs (chords) between angles. Two LeafLaminations are equal, and hash alike,
+    when they have the same degree and the same leafs: the points, as_q_lamination
+    and the visual settings are not compared."""
+
     points: List[Angle]
     degree: Degree
     # dark_theme: bool = True
     leafs: Set[Chord]
     as_q_lamination: bool = True
+    # stamped for the leafs it was built for, and kept up to date by add_leaf
+    _crossing_index: Optional[Tuple[Set[Chord], int, CrossingIndex]] = PrivateAttr(
+        default=None
+    )
+    # what each push_leaf added (None if the leaf was already there), and whether
+    # the leafs were unlinked before it
+    _pushed: List[Tuple[Optional[Chord], bool]] = PrivateAttr(default_factory=list)
+    # stamped for the leafs it was computed for, with the degree
+    _fingerprint: Optional[Tuple[Set[Chord], int, Tuple[Degree, bytes]]] = PrivateAttr(
+        default=None
+    )
+
+    @field_validator("leafs")
+    @classmethod
+    def _track_leafs(cls, leafs):
+        return _TrackedSet(leafs)
 
     def to_polygons(self) -> GapLamination:
         "identifies finite gaps unless it is meant to be a non-q-lamination"
-        polygons: List[Set[Angle]] = []
         if not self.as_q_lamination:
-            for leaf in self.leafs:
-                polygons.append(set([leaf.min, leaf.max]))
+            polygons = [{leaf.min, leaf.max} for leaf in self.leafs]
         else:
+            # union-find over the endpoints, numbered in order of appearance
+            ids: Dict[Angle, int] = {}
+            endpoints: List[Angle] = []
+            parent: List[int] = []
+            size: List[int] = []
+
+            def find(i: int) -> int:
+                while parent[i] != i:
+                    parent[i] = parent[parent[i]]
+                    i = parent[i]
+                return i
+
             for leaf in self.leafs:
-                used_leaf = False
-                for p, other in [(leaf.min, leaf.max), (leaf.max, leaf.min)]:
-                    for polygon in polygons:
-                        if p in polygon:
-                            polygon_with_other = next(
-                                filter(
-                                    lambda others_polygon: other in others_polygon
-                                    and polygon is not others_polygon,
-                                    polygons,
-                                ),
-                                None,
-                            )
-                            if polygon_with_other is None:
-                                polygon.add(other)
-                            else:
-                                polygon.update(
-                                    polygons.pop(polygons.index(polygon_with_other))
-                                )
-                            used_leaf = True
-                            break
-                    if used_leaf:
-                        break
-                if not used_leaf:
-                    polygons.append(set([leaf.min, leaf.max]))
-
-        polygons_ = list(
-            map(lambda s: tuple(sorted(s, key=lambda p: p.to_float())), polygons)
-        )
+                ends = []
+                for p in (leaf.min, leaf.max):
+                    i = ids.setdefault(p, len(endpoints))
+                    if i == len(endpoints):
+                        endpoints.append(p)
+                        parent.append(i)
+                        size.append(1)
+                    ends.append(find(i))
+                small, large = sorted(ends, key=lambda root: size[root])
+                if small != large:
+                    parent[small] = large
+                    size[large] += size[small]
+
+            classes: Dict[int, List[Angle]] = {}
+            for i, p in enumerate(endpoints):
+                classes.setdefault(find(i), []).append(p)
+            polygons = list(classes.values())
+
+        polygons_ = [tuple(sorted(p, key=lambda p: p.sort_key)) for p in polygons]
         return GapLamination(
             polygons=polygons_,
             points=self.points,
             degree=self.degree,  # type: ignore
         )
 
+    def _index(self) -> CrossingIndex:
+        index = _cached(self._crossing_index, self.leafs)
+        if index is None:
+            # (re)built if leafs was changed other than by add_leaf
+            index = CrossingIndex(self.leafs)
+            self._crossing_index = _stamped(self.leafs, index)
+        return index
+
+    def add_leaf(self, leaf: Chord):
+        if leaf in self.leafs:
+            return
+        index = _cached(self._crossing_index, self.leafs)
+        self.leafs.add(leaf)
+        if index is not None:
+            index.add(leaf)
+            self._crossing_index = _stamped(self.leafs, index)
+
+    def push_leaf(self, leaf: Chord):
+        "add_leaf, in a way that pop_leaf can undo"
+        index = self._index()
+        if leaf in self.leafs:
+            self._pushed.append((None, index.unlinked))
+            return
+        self._pushed.append((leaf, index.unlinked))
+        self.leafs.add(leaf)
+        index.add(leaf)
+        self._crossing_index = _stamped(self.leafs, index)
+
+    def pop_leaf(self):
+        "undoes the last push_leaf"
+        leaf, unlinked = self._pushed.pop()
+        if leaf is None:
+            return
+        index = _cached(self._crossing_index, self.leafs)
+        self.leafs.remove(leaf)
+        if index is not None:
+            index.remove(leaf, unlinked)
+            self._crossing_index = _stamped(self.leafs, index)
+
+    def branch(self) -> "LeafLamination":
+        """a copy with its own set of leafs (and crossing index), that shares the
+        chords and angles with this one"""
+        ret = self.model_copy(update={"leafs": _TrackedSet(self.leafs)})
+        index = _cached(self._crossing_index, self.leafs)
+        if index is not None:
+            ret._crossing_index = _stamped(ret.leafs, index.copy())
+        else:
+            ret._crossing_index = None
+        ret._pushed = []
+        return ret
+
+    def fingerprint(self) -> bytes:
+        "a digest of the degree and the leafs"
+        cached = _cached(self._fingerprint, self.leafs)
+        if cached is None or cached[0] != self.degree:
+            groups = ((leaf.min, leaf.max) for leaf in self.leafs)
+            cached = (self.degree, _fingerprint("leafs", self.degree, groups))
+            self._fingerprint = _stamped(self.leafs, cached)
+        return cached[1]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LeafLamination):
+            return NotImplemented
+        return self.fingerprint() == other.fingerprint()
+
+    def __hash__(self) -> int:
+        return hash(self.fingerprint())
+
     def crosses(self, target: Chord) -> bool:
-        return any([target.crosses(reference) for reference in self.leafs])
+        return self._index().crosses(target)
 
     def unlinked(self) -> bool:
-        for i, j in combinations(range(len(self.leafs)), 2):
-            if list(self.leafs)[i].crosses(list(self.leafs)[j]):
-                return False
-        return True
+        return self._index().unlinked
+
+    def first_crossing(self) -> Optional[Tuple[Chord, Chord]]:
+        "a pair of crossing leaves, if there is one"
+        return first_crossing(self.leafs)
 
     @staticmethod
     def empty(d) -> "LeafLamination":
@@ -346,3 +660,182 @@ class LeafLamination(BaseModel, AbstractLamination):
 
 
 AgnosticLamination = Union[LeafLamination, GapLamination]
+
+
+class ColumnarLamination(AbstractLamination):
+    """A lamination stored as arrays rather than angle objects: the vertices of all
+    the polygons in one AngleArray, each polygon being the slice given by offsets
+    and lengths, and the points in another. Leaves are stored as polygons with two
+    vertices, and leafs records whether it stands for a LeafLamination (and
+    as_q_lamination, how that one identifies gaps). Angles are only made when a
+    polygon is asked for, and have the default visual settings. Within a polygon,
+    vertices are kept sorted by their float value."""
+
+    def __init__(
+        self,
+        endpoints: AngleArray,
+        offsets: np.ndarray,
+        lengths: np.ndarray,
+        points: AngleArray,
+        degree: Degree,
+        leafs: bool = False,
+        as_q_lamination: bool = True,
+    ):
+        self.endpoints = endpoints
+        self.offsets = offsets
+        self.lengths = lengths
+        self.points = points  # type: ignore
+        self.degree = degree
+        self.leafs = leafs
+        self.as_q_lamination = as_q_lamination
+
+    @staticmethod
+    def from_polygons(
+        polygons: Sequence[Sequence[Angle]],
+        points: Sequence[Angle],
+        degree: Degree,
+        leafs: bool = False,
+        as_q_lamination: bool = True,
+    ) -> "ColumnarLamination":
+        lengths = np.array([len(polygon) for polygon in polygons], dtype=np.int64)
+        return ColumnarLamination(
+            AngleArray.from_angles(chain.from_iterable(polygons), degree),
+            np.cumsum(lengths) - lengths,
+            lengths,
+            AngleArray.from_angles(points, degree),
+            degree,
+            leafs,
+            as_q_lamination,
+        )._sorted()
+
+    @staticmethod
+    def from_lamination(lam: AgnosticLamination) -> "ColumnarLamination":
+        if isinstance(lam, LeafLamination):
+            leaves = [(leaf.min, leaf.max) for leaf in lam.leafs]
+            return ColumnarLamination.from_polygons(
+                leaves,
+                lam.points,
+                lam.degree,
+                leafs=True,
+                as_q_lamination=lam.as_q_lamination,
+            )
+        return ColumnarLamination.from_polygons(lam.polygons, lam.points, lam.degree)
+
+    def _polygon_ids(self) -> np.ndarray:
+        "for each vertex, the index of its polygon"
+        return np.repeat(np.arange(len(self.lengths)), self.lengths)
+
+    def _sorted(self) -> "ColumnarLamination":
+        order = np.lexsort((self.endpoints.values, self._polygon_ids()))
+        return ColumnarLamination(
+            self.endpoints._select(order),
+            self.offsets,
+            self.lengths,
+            self.points,
+            self.degree,
+            self.leafs,
+            self.as_q_lamination,
+        )
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def view(self, i: int) -> AngleArray:
+        "the vertices of polygon i, without copying"
+        start = self.offsets[i]
+        return self.endpoints._select(slice(start, start + self.lengths[i]))
+
+    def polygon(self, i: int) -> Polygon:
+        return tuple(self.view(i).to_angles())
+
+    def __iter__(self) -> Iterator[Polygon]:
+        return (self.polygon(i) for i in range(len(self)))
+
+    @property
+    def polygons(self) -> List[Polygon]:
+        return list(self)
+
+    def to_gap_lamination(self) -> GapLamination:
+        return GapLamination(
+            polygons=self.polygons, points=self.points.to_angles(), degree=self.degree
+        )
+
+    def to_leaf_lamination(self) -> LeafLamination:
+        if not self.leafs:
+            return self.to_gap_lamination().to_leafs()
+        return LeafLamination(
+            leafs={Chord(*leaf) for leaf in self},
+            points=self.points.to_angles(),
+            degree=self.degree,
+            as_q_lamination=self.as_q_lamination,
+        )
+
+    def to_polygons(self) -> GapLamination:
+        if self.leafs:
+            return self.to_leaf_lamination().to_polygons()
+        return self.to_gap_lamination()
+
+    def lifted(self) -> AgnosticLamination:  # type: ignore
+        """the lifted lamination, which is not columnar: an AngleArray only holds
+        angles reduced mod 1"""
+        if self.leafs:
+            return self.to_leaf_lamination().lifted()
+        return self.to_gap_lamination().lifted()
+
+    def to_leafs(self) -> "ColumnarLamination":  # type: ignore
+        "the edges of the polygons as leaves; a 2-gon has only one edge"
+        if self.leafs:
+            return self
+        ids = self._polygon_ids()
+        starts = self.offsets[ids]
+        lengths = self.lengths[ids]
+        index = np.arange(len(ids))
+        following = starts + (index - starts + 1) % lengths
+        keep = (lengths > 2) | (index == starts)
+        edges = np.stack([index[keep], following[keep]], axis=1).reshape(-1)
+        count = int(keep.sum())
+        return ColumnarLamination(
+            self.endpoints._select(edges),
+            np.arange(count, dtype=np.int64) * 2,
+            np.full(count, 2, dtype=np.int64),
+            self.points,
+            self.degree,
+            leafs=True,
+        )._sorted()
+
+    def apply_function(self, f: Callable[[Angle], Angle]) -> "ColumnarLamination":
+        return ColumnarLamination.from_polygons(
+            [[f(p) for p in polygon] for polygon in self],
+            [f(p) for p in self.points.to_angles()],
+            self.degree,
+            self.leafs,
+            self.as_q_lamination,
+        )
+
+    def filtered(self, f: Callable[[Angle], bool]) -> "ColumnarLamination":
+        vertex_kept = np.array([f(p) for p in self.endpoints.to_angles()], dtype=bool)
+        kept = np.ones(len(self), dtype=bool)
+        np.logical_and.at(kept, self._polygon_ids(), vertex_kept)
+        vertex_kept = kept[self._polygon_ids()]
+        lengths = self.lengths[kept]
+        points_kept = [i for i, p in enumerate(self.points.to_angles()) if f(p)]
+        return ColumnarLamination(
+            self.endpoints._select(vertex_kept),
+            np.cumsum(lengths) - lengths,
+            lengths,
+            self.points._select(np.array(points_kept, dtype=np.int64)),
+            self.degree,
+            self.leafs,
+            self.as_q_lamination,
+        )
+
+    def after_sigma(self) -> "ColumnarLamination":  # type: ignore
+        return ColumnarLamination(
+            self.endpoints.after_sigma(),
+            self.offsets,
+            self.lengths,
+            self.points.after_sigma(),
+            self.degree,
+            self.leafs,
+            self.as_q_lamination,
+        )._sorted()
@@ -109,11 +109,8 @@ def psi(x: Angle, a: Angle, lesser=True) -> Angle:
                 digits.append(xi + 1)
             iterate = sigma(iterate)
         digits_parts.append(digits)
-    return NaryFraction(
-        exact=digits_parts[0],
-        repeating=digits_parts[1],
-        degree=d,
-        visual_settings=x.visual_settings,
+    return NaryFraction.interned(
+        d, digits_parts[0], digits_parts[1], visual_settings=x.visual_settings
     )
 
 
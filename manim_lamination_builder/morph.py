@@ -160,7 +160,7 @@ class OccludedLamination(BaseModel):
 
 def interpolate_quotent_of_region_of_rotational_polygon(lam: GapLamination):
     fixed = sigma(lam.polygons[0])
-    start = min(fixed, key=lambda v: v.to_float())
+    start = min(fixed, key=lambda v: v.sort_key)
 
     d = lam.degree
     critical_cord = HalfOpenArc(
@@ -1,6 +1,8 @@
-from copy import deepcopy
-from itertools import combinations, combinations_with_replacement, permutations, product
-from typing import Dict, Iterator, List, Sequence
+from functools import lru_cache
+from itertools import combinations_with_replacement, permutations, product
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
 
 from manim_lamination_builder.chord import Chord
 from manim_lamination_builder.lamination import GapLamination, LeafLamination, Polygon
@@ -25,61 +27,90 @@ def valid_polygon_indices(degree, di, order):
             yield indices
 
 
-def sibling_portraits(
-    verticies: Sequence[Sequence[PrincipalAngle]],
-) -> List[GapLamination]:
+@lru_cache(maxsize=None)
+def _sibling_portrait_templates(
+    order: int, degree: int
+) -> Tuple[Tuple[Tuple[Tuple[int, int], ...], ...], ...]:
     """
-    Takes a list of verticies to be connected. It is a list of the preimages of the
-    verticies of the original polygons. On both levels, we use positional order.
-
-    This assumes that all the verticies are in the same round gap. If they are not,
-    that can be filteded afterward.
+    The portraits found by sibling_portraits for order lists of degree verticies,
+    with each vertex given as its (list, position in list). These only depend on the
+    shape because the preimages of the verticies of a polygon interleave: once the
+    lists are sorted by their first vertex, the j-th vertex of list c is the
+    (j * order + c)-th vertex counterclockwise.
     """
-    ret = []
-    order = len(verticies)
-    degree = len(verticies[0])
     if degree == 0:
-        return [GapLamination([], [], 2)]  # the 2 here will not be
-    verticies = sorted(verticies, key=lambda lst: lst[0].to_float())
-    lam_degree = verticies[0][0].degree
-    assert all([len(verticies[i]) == degree for i in range(len(verticies))])
+        return ((),)
 
+    def ccw_position(vertex: Tuple[int, int]) -> int:
+        return vertex[1] * order + vertex[0]
+
+    ret = []
     # this is for the polygon containing the vertex [0][0]
     # choose the degree of the polygon
     for di in range(1, degree + 1):
         # we have degree - di balls and di*order-1 bars
         for indices in valid_polygon_indices(degree, di, order):
-            polygon: List[PrincipalAngle] = []
-            child_options = [GapLamination([], [], verticies[0][0].degree)]
+            polygon: List[Tuple[int, int]] = []
+            child_options: List[tuple] = [()]
             lens = 0
             for i, j in enumerate(indices):
                 color = i % order
-                polygon.append(verticies[color][j])
+                polygon.append((color, j))
                 next = degree + 1 if i + 1 == order * di else indices[i + 1]
                 if (i + 1) % order == 0:
                     next -= 1
+                # clipped to the lists, as slices of them would be
+                before = range(j + 1, min(next + 1, degree))
+                after = range(j, min(next, degree))
                 subtended_arc = [
-                    verticies[color][j + 1 : next + 1] for color in range(0, color + 1)
-                ] + [verticies[color][j:next] for color in range(color + 1, order)]
+                    [(c, k) for k in before] for c in range(0, color + 1)
+                ] + [[(c, k) for k in after] for c in range(color + 1, order)]
 
                 lens += len(subtended_arc[0])
                 assert di + len(subtended_arc[0]) <= degree
 
-                new_child_options = []
-                for a, b in product(
-                    child_options,
-                    sibling_portraits(subtended_arc),
-                ):
-                    new = GapLamination(a.polygons + b.polygons, [], lam_degree)
-                    new_child_options.append(new)
-                child_options = new_child_options
+                # sorted by their first vertex, the lists after this color come first
+                subtended_arc = subtended_arc[color + 1 :] + subtended_arc[: color + 1]
+                sub_options = [
+                    tuple(tuple(subtended_arc[c][k] for c, k in p) for p in portrait)
+                    for portrait in _sibling_portrait_templates(
+                        order, len(subtended_arc[0])
+                    )
+                ]
+                child_options = [a + b for a, b in product(child_options, sub_options)]
             assert di + lens == degree
-            for lam in child_options:
-                lam.polygons.append(tuple(polygon))
-                # assert set(sum(verticies, [])) == set(sum(lam.polygons, ()))
-            ret += child_options
+            polygon_ = tuple(sorted(polygon, key=ccw_position))
+            ret += [portrait + (polygon_,) for portrait in child_options]
+
+    return tuple(ret)
 
-    return ret
+
+def sibling_portraits(
+    verticies: Sequence[Sequence[PrincipalAngle]],
+) -> List[GapLamination]:
+    """
+    Takes a list of verticies to be connected. It is a list of the preimages of the
+    verticies of the original polygons. On both levels, we use positional order.
+
+    This assumes that all the verticies are in the same round gap. If they are not,
+    that can be filteded afterward.
+    """
+    order = len(verticies)
+    degree = len(verticies[0])
+    if degree == 0:
+        return [GapLamination([], [], 2)]  # the 2 here will not be
+    verticies = sorted(verticies, key=lambda lst: lst[0].sort_key)
+    lam_degree = verticies[0][0].degree
+    assert all([len(verticies[i]) == degree for i in range(len(verticies))])
+
+    return [
+        GapLamination._trusted(
+            [tuple(verticies[c][j] for c, j in polygon) for polygon in portrait],
+            [],
+            lam_degree,
+        )
+        for portrait in _sibling_portrait_templates(order, degree)
+    ]
 
 
 def _sibling_collections_of_leaf(leaf) -> Iterator[List[Chord]]:
@@ -111,26 +142,32 @@ def _sibling_collections_of_leaf_in_existing(
     """
     Considers one leaf at a time and considers all the ways to fit in exactly the right number of pre images.
     Takes into consideration a list of pre_images that is is required to have.
+    The leaves of each collection are pushed onto existing and popped back off, so
+    only the collections that fit are copied.
     """
     contextual_collections = []
 
     for collection in _sibling_collections_of_leaf(leaf):
         requirements_fulfiled = 0
-        contextual_collection = deepcopy(existing)
+        pushed = 0
         for l in collection:
-            if contextual_collection.crosses(l):
+            if existing.crosses(l):
                 break
             if l in required_pre_images:
                 requirements_fulfiled += 1
                 if not cumulative:
-                    contextual_collection.leafs.add(l)
+                    existing.push_leaf(l)
+                    pushed += 1
                 continue
             elif len(required_pre_images) == len(collection):
                 break
-            contextual_collection.leafs.add(l)
+            existing.push_leaf(l)
+            pushed += 1
         else:  # exited normally
             if len(required_pre_images) == requirements_fulfiled:
-                contextual_collections.append(contextual_collection)
+                contextual_collections.append(existing.branch())
+        for _ in range(pushed):
+            existing.pop_leaf()
     return contextual_collections
 
 
@@ -147,41 +184,148 @@ def pre_image_dictionary(lam: GapLamination) -> Dict[Polygon, List[Polygon]]:
     return ret
 
 
-def next_pull_back(lam: GapLamination, cumulative=False) -> List[GapLamination]:
+def _bitset(row: np.ndarray) -> int:
+    "the int whose k-th bit is row[k]"
+    return int.from_bytes(np.packbits(row, bitorder="little").tobytes(), "little")
+
+
+def _compatibility(options: List[List[GapLamination]]) -> List[List[List[int]]]:
+    """
+    For the portraits options[i][k], the bitset of the portraits of each other
+    polygon j that it is unlinked from: bit l of ret[i][k][j] is set when
+    options[i][k] and options[j][l] can be in the same lamination.
+
+    Polygons with distinct verticies are unlinked when the verticies of one all lie
+    in the same arc between consecutive verticies of the other. Verticies are
+    replaced by their rank counterclockwise, so this is exact, and all the
+    portraits of two polygons are compared at once with NumPy.
+    """
+    # the portraits of a polygon share their vertex objects
+    verticies = {
+        id(p): p
+        for portraits in options
+        for port in portraits
+        for polygon in port.polygons
+        for p in polygon
+    }
+    ranked = sorted(verticies, key=lambda key: verticies[key].sort_key)
+    rank = {key: r for r, key in enumerate(ranked)}
+
+    # for each polygon of each portrait of options[i]: how many of its verticies come
+    # before each rank, and its size
+    before: List[np.ndarray] = []
+    sizes: List[np.ndarray] = []
+    # the ranks of the verticies of each polygon of each portrait of options[i], and
+    # of the first vertex of the polygon each is in
+    flat: List[np.ndarray] = []
+    flat_first: List[np.ndarray] = []
+    # where the polygons of each portrait start in the rows of before, and where the
+    # verticies of each portrait start in flat
+    portrait_starts: List[np.ndarray] = []
+    vertex_starts: List[np.ndarray] = []
+    for portraits in options:
+        polygons = [polygon for port in portraits for polygon in port.polygons]
+        ranks = np.array(
+            [rank[id(p)] for polygon in polygons for p in polygon], dtype=np.int64
+        )
+        lengths = np.array([len(polygon) for polygon in polygons], dtype=np.int64)
+        # polygons are small, so their arcs fit in int16
+        indicator = np.zeros((len(polygons), len(ranked) + 1), dtype=np.int16)
+        indicator[np.repeat(np.arange(len(polygons)), lengths), ranks + 1] = 1
+        before.append(np.cumsum(indicator, axis=1, dtype=np.int16))
+        sizes.append(lengths.astype(np.int16))
+        polygon_starts = np.cumsum(lengths) - lengths
+        flat.append(ranks)
+        flat_first.append(np.repeat(ranks[polygon_starts], lengths))
+        counts = [len(port.polygons) for port in portraits]
+        portrait_starts.append(np.cumsum([0] + counts[:-1]).astype(np.int64))
+        vertex_starts.append(polygon_starts[portrait_starts[-1]])
+
+    ret = [[[0] * len(options) for _ in portraits] for portraits in options]
+    for i in range(len(options)):
+        for j in range(i + 1, len(options)):
+            if len(options[i]) == 0 or len(options[j]) == 0:
+                continue
+            # whether each vertex from j is in a different arc of each polygon from i
+            # than the first vertex of its polygon (the arcs before the first vertex
+            # and after the last are the same)
+            offset = before[i][:, flat[j]] - before[i][:, flat_first[j]]
+            apart = offset % sizes[i][:, None] != 0
+            linked = np.logical_or.reduceat(apart, vertex_starts[j], axis=1)
+            linked = np.logical_or.reduceat(linked, portrait_starts[i], axis=0)
+            compatible = ~linked
+            for k in range(len(options[i])):
+                ret[i][k][j] = _bitset(compatible[k])
+            for l in range(len(options[j])):
+                ret[j][l][i] = _bitset(compatible[:, l])
+    return ret
+
+
+def iter_pull_backs(lam: GapLamination) -> Iterator[GapLamination]:
+    """
+    Yields the laminations of next_pull_back one at a time. A portrait is chosen for
+    each polygon depth first, starting with the polygons that have the fewest (and
+    then the largest). Each choice narrows the bitsets of the portraits still
+    allowed for the remaining polygons, and a branch is abandoned as soon as one of
+    them is empty. Only the current branch of the search is kept.
+    The polygons of each result are in the order of the polygons of lam.
+    """
     d = lam.degree
     existing_pre_images = pre_image_dictionary(lam)
-    assert not cumulative
-    # TODO: deal make non-cumulative
-    if cumulative:
-        ret = [deepcopy(lam)]
-    else:
-        ret = [GapLamination.empty(d)]
-    for poly in list(lam.polygons):
-        new_ret = []
+    options: List[List[GapLamination]] = []
+    for poly in lam.polygons:
         required_pre_images = existing_pre_images.get(poly, [])
-        portraits = []
         if sum([len(p) for p in required_pre_images]) == d * len(poly):
+            portraits = [GapLamination._trusted(required_pre_images, [], d)]
+        else:
+            verticies = [p.pre_images() for p in poly]
             portraits = [
-                GapLamination(polygons=required_pre_images, points=[], degree=d)
+                port
+                for port in sibling_portraits(verticies)
+                if all([req in port.polygons for req in required_pre_images])
             ]
+        options.append(portraits)
+    if len(options) == 0:
+        yield GapLamination.empty(d)
+        return
+    if any(len(portraits) == 0 for portraits in options):
+        return
+    compatible = _compatibility(options)
+    search_order = sorted(
+        range(len(options)), key=lambda i: (len(options[i]), -len(lam.polygons[i]))
+    )
+
+    chosen: List[GapLamination] = [GapLamination.empty(d)] * len(options)
+    allowed = [(1 << len(portraits)) - 1 for portraits in options]
+    # for each polygon in the branch, the portraits left to try and the bitsets
+    # allowed for every polygon when it was reached
+    branch = [(allowed[search_order[0]], allowed)]
+    while len(branch) > 0:
+        depth = len(branch) - 1
+        remaining, allowed = branch[-1]
+        if remaining == 0:
+            branch.pop()
+            continue
+        k = (remaining & -remaining).bit_length() - 1
+        branch[-1] = (remaining & (remaining - 1), allowed)
+        i = search_order[depth]
+        chosen[i] = options[i][k]
+        if depth + 1 == len(search_order):
+            yield GapLamination._joined(chosen, d)
+            continue
+        narrowed = allowed.copy()
+        for j in search_order[depth + 1 :]:
+            narrowed[j] &= compatible[i][k][j]
+            if narrowed[j] == 0:
+                break
         else:
-            verticies = [p.pre_images() for p in poly]
-            portraits = sibling_portraits(verticies)
-            portraits = filter(
-                lambda port: all([req in port.polygons for req in required_pre_images]),
-                portraits,
-            )
-        for portrait in portraits:
-            for existing in ret:
-                if portrait.coexists(existing):
-                    new = GapLamination(
-                        polygons=existing.polygons + portrait.polygons,
-                        points=[],
-                        degree=d,
-                    )
-                    new_ret.append(new)
-        ret = new_ret
-    return ret
+            branch.append((narrowed[search_order[depth + 1]], narrowed))
+
+
+def next_pull_back(lam: GapLamination, cumulative=False) -> List[GapLamination]:
+    assert not cumulative
+    # TODO: deal make non-cumulative
+    return list(iter_pull_backs(lam))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 import numpy as np
 
-from manim_lamination_builder.points import NaryFraction
+from manim_lamination_builder.points import NaryFraction, orbit
 
 
 class PeriodicOrbit:
@@ -52,7 +52,6 @@ class PeriodicOrbit:
             for f in range(len(fixedPoints)):
                 if point.to_float() < fixedPoints[f]:
                     depSeq[f-1] += 1
-            point = point.after_sigma()
 
         return depSeq
 
@@ -76,16 +75,12 @@ class PeriodicOrbit:
 
     # returns a full orbit in spacial order
     def _full_orbits(self, point: NaryFraction):
-        assert (
-            len(point.exact) == 0 and len(point.repeating) != 0
-        ), "must be periodic point"
-        p = point
-        fOrbit = []
+        assert point.periodic(), "must be periodic point"
+        cycle = orbit(point).cycle
+        # starting from sigma(point), ending with point
+        fOrbit = list(cycle[1:] + cycle[:1])
         sOrbit = []
         tOrbit = []
-        for i in range(len(point.repeating)):
-            p = p.after_sigma()
-            fOrbit += [p]
         sOrbit = sorted(fOrbit)
         startPoint = sOrbit[0]
         startIndex = fOrbit.index(startPoint)
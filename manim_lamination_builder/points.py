@@ -4,16 +4,28 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import math
 from abc import ABC, abstractmethod
-from functools import lru_cache, total_ordering
-from math import ceil, cos, floor, log, pi, sin
+from collections import OrderedDict
+from fractions import Fraction
+from functools import cached_property, lru_cache, total_ordering
+from math import cos, floor, pi, sin
 from typing import Annotated, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
 
 import numpy as np
 from annotated_types import Gt
-from manim.animation.animation import deepcopy
-from pydantic import BaseModel, ValidationInfo, field_validator, model_validator
-
-from manim_lamination_builder.visual_settings import VisualSettings
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    PrivateAttr,
+    ValidationInfo,
+    field_validator,
+    model_serializer,
+    model_validator,
+)
+
+from manim_lamination_builder.visual_settings import (
+    DEFAULT_VISUAL_SETTINGS,
+    VisualSettings,
+)
 
 T = TypeVar("T")
 
@@ -24,10 +36,25 @@ def angle_to_cartesian(angle: float):
 
 Degree = Annotated[int, Gt(1)]
 
+# angles without an exact representation are identified when they share a bucket
+# of this width
+FLOAT_TOLERANCE = 0.0000002
+
+
+def _float_bucket(x: float) -> int:
+    return floor(x / FLOAT_TOLERANCE)
+
+
+def _is_default_style(visual_settings: VisualSettings) -> bool:
+    return (
+        visual_settings is DEFAULT_VISUAL_SETTINGS
+        or visual_settings == DEFAULT_VISUAL_SETTINGS
+    )
+
 
 @total_ordering
 class _Angle(ABC):
-    visual_settings: VisualSettings = VisualSettings()
+    visual_settings: VisualSettings = DEFAULT_VISUAL_SETTINGS
     degree: Degree
 
     def __repr__(self) -> str:
@@ -55,16 +82,29 @@ class _Angle(ABC):
         return angle_to_cartesian(self.to_angle())
 
     def __eq__(self, other):
-        return self.__hash__() == other.__hash__()
+        """float fallback: angles are equal when they fall in the same bucket of
+        width FLOAT_TOLERANCE. NaryFraction overrides this with exact equality
+        amongst its own instances. Every angle hashes by its bucket, so that equal
+        angles of different types hash alike."""
+        if isinstance(other, _Angle):
+            return _float_bucket(self.to_float()) == _float_bucket(other.to_float())
+        if isinstance(other, (float, int)):
+            return _float_bucket(self.to_float()) == _float_bucket(other)
+        return NotImplemented
 
-    def __hash__(self):  # TODO: is there a better way to do this?
-        return hash(floor(self.to_float() / 0.0000002))
-        # rep = self.to_nary_fraction()
-        # return hash(hash(rep.exact) + hash(rep.repeating) + hash(rep.degree))
+    def __hash__(self):
+        return hash(_float_bucket(self.to_float()))
+
+    @cached_property
+    def sort_key(self) -> Tuple[float, Union[float, Fraction]]:
+        """what angles are ordered by, computed once per point: the float, then an
+        exact value to break ties between points floats can't tell apart"""
+        value = self.to_float()
+        return (value, value)
 
     def __lt__(self, other) -> bool:
         if isinstance(other, _Angle):
-            return self.to_float() < other.to_float()
+            return self.sort_key < other.sort_key
         if isinstance(other, float):
             return self.to_float() < other
         return NotImplemented
@@ -88,6 +128,13 @@ class _Angle(ABC):
     def pre_images(self) -> Sequence["_Angle"]:
         pass
 
+    def restyled(self: T, **changes) -> T:
+        """a copy of self drawn with the given VisualSettings fields changed. Points
+        share their (immutable) VisualSettings, so this is how to restyle one."""
+        return self.model_copy(  # type: ignore
+            update={"visual_settings": self.visual_settings.restyled(**changes)}
+        )
+
     def lifted(self) -> "LiftedAngle":
         return LiftedAngle(
             self.to_float(), self.degree, visual_settings=self.visual_settings
@@ -112,7 +159,9 @@ class _Angle(ABC):
 class FloatWrapper(_Angle, BaseModel):
     value: float
 
-    def __init__(self, value: float, degree: Degree, visual_settings=VisualSettings()):
+    def __init__(
+        self, value: float, degree: Degree, visual_settings=DEFAULT_VISUAL_SETTINGS
+    ):
         super(FloatWrapper, self).__init__(
             value=value % 1, degree=degree, visual_settings=visual_settings
         )
@@ -124,11 +173,12 @@ class FloatWrapper(_Angle, BaseModel):
         return str(self.value)
 
     def after_sigma(self) -> "FloatWrapper":
-        after = deepcopy(self)
         assert self.degree is not None
-        after.value *= self.degree
-        after.value %= 1
-        return after
+        return FloatWrapper.model_construct(
+            value=self.value * self.degree % 1,
+            degree=self.degree,
+            visual_settings=self.visual_settings,
+        )
 
     def has_degree(self):
         return self.degree is not None
@@ -136,9 +186,9 @@ class FloatWrapper(_Angle, BaseModel):
     def pre_images(self) -> List["FloatWrapper"]:
         assert self.degree is not None
         return [
-            FloatWrapper(
-                self.value / self.degree + digit / self.degree,
-                self.degree,
+            FloatWrapper.model_construct(
+                value=(self.value + digit) / self.degree,
+                degree=self.degree,
                 visual_settings=self.visual_settings,
             )
             for digit in range(self.degree)
@@ -146,16 +196,31 @@ class FloatWrapper(_Angle, BaseModel):
 
 
 class NaryFraction(_Angle, BaseModel):
+    """An angle given by its d-ary expansion. Two instances are equal exactly
+    when they are the same rational number, regardless of degree. Comparison with
+    other kinds of angles falls back to the floating point buckets of _Angle.
+
+    Internally the angle is the reduced fraction _ratio, which is all that sigma,
+    pre-images and comparisons use. Points produced that way only expand their
+    digits (exact and repeating) when they are first needed, e.g. by to_string.
+
+    Points with the default style are shared (see interned), so instances are
+    frozen: restyle a copy made with restyled instead of assigning to one."""
+
+    model_config = ConfigDict(frozen=True)
+
     degree: Degree
     exact: tuple[int, ...]
     repeating: tuple[int, ...]
+    # reduced (numerator, denominator)
+    _ratio: Tuple[int, int] = PrivateAttr()
 
     def __init__(
         self,
         exact: tuple[int, ...],
         repeating: tuple[int, ...],
         degree: Degree,
-        visual_settings=VisualSettings(),
+        visual_settings=DEFAULT_VISUAL_SETTINGS,
     ):
         super(NaryFraction, self).__init__(
             exact=exact,
@@ -174,44 +239,81 @@ class NaryFraction(_Angle, BaseModel):
             )
         return v
 
-    # TODO: simplify more
     # https://github.com/csfalcione/laminations-lib/blob/master/src/fractions.ts
-    @model_validator(mode="before")
-    @classmethod
-    def _simplify(cls, v: dict) -> dict:
-        assert isinstance(v, dict)
-        degree = v["degree"]
-        exact = v["exact"]
-        repeating = v["repeating"]
-        # over-specified exact part
-        while len(exact) > 0 and len(repeating) > 0 and exact[-1] == repeating[-1]:
-            exact = exact[:-1]
-            repeating = (repeating[-1],) + tuple(repeating[:-1])
+    @staticmethod
+    def _canonical(
+        degree: Degree, exact: Sequence[int], repeating: Sequence[int]
+    ) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        return NaryFraction._canonical_tuples(
+            int(degree), tuple(exact), tuple(repeating)
+        )
 
+    @staticmethod
+    def _minimal_period(digits: Tuple[int, ...]) -> int:
+        "length of the shortest block that digits is a repetition of (KMP)"
+        n = len(digits)
+        if n == 0:
+            return 0
+        prefix = [0] * n
+        k = 0
+        for i in range(1, n):
+            while k > 0 and digits[i] != digits[k]:
+                k = prefix[k - 1]
+            if digits[i] == digits[k]:
+                k += 1
+            prefix[i] = k
+        period = n - prefix[-1]
+        return period if n % period == 0 else n
+
+    @lru_cache(maxsize=1 << 14)
+    @staticmethod
+    def _canonical_tuples(
+        degree: int, exact: Tuple[int, ...], repeating: Tuple[int, ...]
+    ) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
         # over-specified repeating
-        testStr = "".join(map(str, repeating))
-        index = (testStr + testStr)[1:-1].find(testStr)
-        if index != -1:
-            repeating = repeating[: index + 1]
+        repeating = repeating[: NaryFraction._minimal_period(repeating)]
+        period = len(repeating)
+
+        # over-specified exact part: the trailing exact digits that continue the
+        # cycle backwards are absorbed by rotating the repeating part
+        end = len(exact)
+        if period > 0:
+            while (
+                end > 0 and exact[end - 1] == repeating[(end - len(exact) - 1) % period]
+            ):
+                end -= 1
+            shift = (len(exact) - end) % period
+            if shift:
+                repeating = repeating[-shift:] + repeating[:-shift]
 
         # trailing zeros
         if repeating == (0,):
             repeating = ()
-        while len(exact) > 1 and exact[-1] == 0 and repeating == ():
-            exact = exact[:-1]
+        if repeating == ():
+            while end > 0 and exact[end - 1] == 0:
+                end -= 1
 
-        # TODO: repeating d-1 in base d-1
+        # repeating d-1 in base d: carry into the exact part
         if repeating == (degree - 1,):
             repeating = ()
-            if exact:
-                exact = exact[:-1] + (exact[-1] + 1,)
-            else:
-                exact = (0,)
-
-        if (exact == (0,) or exact == ()) and repeating == ():
-            exact = ()
+            while end > 0 and exact[end - 1] == degree - 1:
+                end -= 1
+            if end > 0:
+                exact = exact[: end - 1] + (exact[end - 1] + 1,)
+                end = len(exact)
+
+        exact = exact[:end]
+        if exact == () and repeating == ():
             repeating = (0,)
 
+        return exact, repeating
+
+    @model_validator(mode="before")
+    @classmethod
+    def _simplify(cls, v: dict) -> dict:
+        assert isinstance(v, dict)
+        degree = v["degree"]
+        exact, repeating = NaryFraction._canonical(degree, v["exact"], v["repeating"])
         return {
             "degree": degree,
             "exact": exact,
@@ -219,9 +321,61 @@ class NaryFraction(_Angle, BaseModel):
             "visual_settings": v["visual_settings"],
         }
 
+    def model_post_init(self, __context) -> None:
+        # points built by _trusted set their ratio themselves and have no digits yet
+        if "exact" in self.__dict__:
+            self._ratio = NaryFraction._to_ratio(
+                self.degree, self.exact, self.repeating
+            )
+
+    def __getattr__(self, item):
+        if item in ("exact", "repeating"):
+            exact, repeating = NaryFraction._ratio_to_digits(*self._ratio, self.degree)
+            self.__dict__["exact"] = exact
+            self.__dict__["repeating"] = repeating
+            return self.__dict__[item]
+        return super().__getattr__(item)  # type: ignore
+
+    @model_serializer(mode="wrap")
+    def _serialize_with_digits(self, handler):
+        # points built from a ratio only get their digits on first access
+        self.exact
+        return handler(self)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, NaryFraction):
+            return self._ratio == other._ratio
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return self.bucket_hash
+
+    @cached_property
+    def bucket_hash(self) -> int:
+        """the hash, computed once per point. It is the float bucket of _Angle rather
+        than the ratio, so that it agrees with the float fallback of __eq__ for
+        other angles; equal rationals have equal floats, so it also agrees with the
+        exact equality amongst NaryFractions"""
+        return _Angle.__hash__(self)
+
+    @cached_property
+    def sort_key(self) -> Tuple[float, Union[float, Fraction]]:
+        return (self.to_float(), Fraction(*self._ratio))
+
+    def __lt__(self, other) -> bool:
+        if isinstance(other, NaryFraction):
+            p, q = self._ratio
+            r, s = other._ratio
+            return p * s < r * q
+        return super().__lt__(other)
+
     @staticmethod
     def from_string(
-        degree: Degree, string_representation: str, visual_settings=VisualSettings()
+        degree: Degree,
+        string_representation: str,
+        visual_settings=DEFAULT_VISUAL_SETTINGS,
     ):
         assert "." not in string_representation
         parts = string_representation.split("_")
@@ -229,12 +383,71 @@ class NaryFraction(_Angle, BaseModel):
         repeating = ()
         if len(parts) > 1:
             repeating = tuple([int(i) for i in parts[1]])
-        return NaryFraction(
-            degree=degree,
-            exact=exact,
-            repeating=repeating,
-            visual_settings=VisualSettings(),
+        return NaryFraction.interned(degree, exact, repeating)
+
+    @staticmethod
+    def _trusted(
+        degree: Degree,
+        numerator: int,
+        denominator: int,
+        visual_settings: VisualSettings,
+    ) -> "NaryFraction":
+        """construction without validation from a reduced fraction in [0, 1), such as
+        the results of after_sigma and pre_images"""
+        default_style = _is_default_style(visual_settings)
+        key = (degree, numerator, denominator)
+        if default_style:
+            ret = intern_table.get(key)
+            if ret is not None:
+                return ret
+            visual_settings = DEFAULT_VISUAL_SETTINGS
+        ret = NaryFraction.model_construct(
+            degree=degree, visual_settings=visual_settings
         )
+        ret._ratio = (numerator, denominator)
+        if default_style:
+            intern_table.add(key, ret)
+        return ret
+
+    @staticmethod
+    def interned(
+        degree: Degree,
+        exact: Sequence[int],
+        repeating: Sequence[int],
+        visual_settings: Optional[VisualSettings] = None,
+    ) -> "NaryFraction":
+        """returns the instance shared through intern_table, keyed on (degree,
+        numerator, denominator) of the reduced ratio, when the point has the default
+        visual settings. NaryFractions are frozen, so sharing it is safe (restyle a
+        copy made with restyled instead). Styled points are constructed as usual."""
+        if visual_settings is not None and not _is_default_style(visual_settings):
+            return NaryFraction(
+                exact=tuple(exact),
+                repeating=tuple(repeating),
+                degree=degree,
+                visual_settings=visual_settings,
+            )
+        if not all(0 <= n < degree for n in tuple(exact) + tuple(repeating)):
+            # the table is keyed on values, so invalid digits must not reach it;
+            # validation raises as usual
+            return NaryFraction(
+                exact=tuple(exact),
+                repeating=tuple(repeating),
+                degree=degree,
+                visual_settings=DEFAULT_VISUAL_SETTINGS,
+            )
+        exact, repeating = NaryFraction._canonical(degree, exact, repeating)
+        key = (degree,) + NaryFraction._to_ratio(degree, exact, repeating)
+        ret = intern_table.get(key)
+        if ret is None:
+            ret = NaryFraction(
+                exact=exact,
+                repeating=repeating,
+                degree=degree,
+                visual_settings=DEFAULT_VISUAL_SETTINGS,
+            )
+            intern_table.add(key, ret)
+        return ret
 
     def to_string(self):
         overflow_string = ""
@@ -253,139 +466,204 @@ class NaryFraction(_Angle, BaseModel):
         return overflow_string + exact_string + repeating_string
 
     def after_sigma(self) -> "NaryFraction":
-        # multiply the exact part by degree
-        exact = self.exact
-        repeating = self.repeating
-        if self.repeating:
-            carry = repeating[0]
-            repeating = repeating[1:] + (carry,)
-            exact = exact + (carry,)
-        exact = exact[1:]
-        return NaryFraction(
-            degree=self.degree,
-            exact=exact,
-            repeating=repeating,
-            visual_settings=self.visual_settings,
+        # d * p / q modulo 1, the only common factors with q are those of d
+        numerator, denominator = self._ratio
+        numerator = numerator * self.degree % denominator
+        common = math.gcd(self.degree, denominator)
+        return NaryFraction._trusted(
+            self.degree,
+            numerator // common,
+            denominator // common,
+            self.visual_settings,
         )
 
     def pre_images(self) -> List["NaryFraction"]:
-        ret = [
-            NaryFraction(
-                degree=self.degree,
-                exact=(digit,) + self.exact,
-                repeating=self.repeating,
-                visual_settings=self.visual_settings,
+        # (p + digit * q) / (d * q), whose common factors must also divide d
+        numerator, denominator = self._ratio
+        ret = []
+        for digit in range(self.degree):
+            pre_numerator = numerator + digit * denominator
+            common = math.gcd(pre_numerator, self.degree)
+            ret.append(
+                NaryFraction._trusted(
+                    self.degree,
+                    pre_numerator // common,
+                    denominator * self.degree // common,
+                    self.visual_settings,
+                )
             )
-            for digit in range(self.degree)
-        ]
         assert ret[0].visual_settings == self.visual_settings
         return ret
 
-    @lru_cache(maxsize=None)
     @staticmethod
-    def _cached_to_float(
-        degree: Degree, exact: tuple[int, ...], repeating: tuple[int, ...]
-    ) -> float:
-        value = sum([n / degree ** (i + 1) for i, n in enumerate(exact)])
-        if len(repeating) != 0:
-            value += (
-                sum(
-                    [
-                        n / degree ** (i + 1 - len(repeating))
-                        for i, n in enumerate(repeating)
-                    ]
-                )
-                / degree ** len(exact)
-                / (degree ** len(repeating) - 1)
-            )
-        return value
+    def from_float(
+        x: float, d: int, rounding_max_period=5, visual_settings=DEFAULT_VISUAL_SETTINGS
+    ) -> "NaryFraction":
+        """the point is rounded to a nearby periodic point if one is within floating
+        point precision, and otherwise to a point with a finite expansion. See
+        from_floats"""
+        return NaryFraction.from_floats(
+            [x], d, max_period=rounding_max_period, visual_settings=visual_settings
+        )[0]
 
     @lru_cache(maxsize=None)
     @staticmethod
-    def _get_precizion(d: int) -> int:
-        return ceil(53 * log(2, d))
+    def _candidate_denominators(
+        d: int, max_period: int, max_pre_period: Optional[int]
+    ) -> Tuple[int, ...]:
+        """the denominators d**k * (d**m - 1) of points with pre-period k and period
+        dividing m, and d**k for finite expansions, in increasing order. They are
+        kept below 2**53 so that they, and the numerators rounded against them, are
+        exact as floats."""
+        limit = 2**53
+        ret = set()
+        for m in range(max_period + 1):
+            factor = d**m - 1 if m > 0 else 1
+            k = 0
+            while factor * d**k <= limit and (
+                max_pre_period is None or k <= max_pre_period
+            ):
+                ret.add(factor * d**k)
+                k += 1
+        return tuple(sorted(ret))
 
     @staticmethod
-    def from_float(
-        x: float, d: int, rounding_max_period=5, visual_settings=VisualSettings()
-    ) -> "NaryFraction":
-        """after finding the digits of the point up to the floating point precision,
-        an attempt is made to round this to a nearby periodic point"""
-        x = x % 1
-        n = NaryFraction._get_precizion(d)
-
-        digits = []
-        for _ in range(n):
-            x *= d
-            digit = int(x)
-            digits.append(digit)
-            x -= digit
-
-        best_approximation = NaryFraction(
-            exact=tuple(digits),
-            repeating=(),
-            degree=d,
-            visual_settings=visual_settings,
+    def from_floats(
+        xs: Union[Sequence[float], np.ndarray],
+        d: int,
+        max_period: int = 5,
+        max_pre_period: Optional[int] = None,
+        tolerance: float = 0.0,
+        visual_settings=DEFAULT_VISUAL_SETTINGS,
+        chunk_size: int = 1 << 12,
+    ) -> List["NaryFraction"]:
+        """Exact points for many floats at once. Each x becomes the fraction with
+        the smallest denominator that is within tolerance of x and has a period of
+        at most max_period and a pre-period of at most max_pre_period. If there is
+        none, the closest such fraction is used."""
+        xs = np.asarray(xs, dtype=np.float64).reshape(-1) % 1
+        q = np.array(
+            NaryFraction._candidate_denominators(d, max_period, max_pre_period),
+            dtype=np.int64,
         )
-        error = abs(x - best_approximation.to_float())
-        for p in range(1, rounding_max_period + 1):
-            if error == 0:
-                return best_approximation
-            point = NaryFraction(
-                exact=tuple(digits[:-p]),
-                repeating=tuple(digits[-p:]),
-                degree=d,
-                visual_settings=visual_settings,
+        ret = []
+        for start in range(0, len(xs), chunk_size):
+            x = xs[start : start + chunk_size, None]
+            numerators = np.rint(x * q)
+            error = np.abs(x - numerators / q)
+            numerators = numerators.astype(np.int64) % q
+            common = np.gcd(numerators, q)
+            numerators, denominators = numerators // common, q // common
+            close = error <= tolerance
+            choice = np.where(
+                close.any(axis=1),
+                np.where(close, denominators, np.iinfo(np.int64).max).argmin(axis=1),
+                error.argmin(axis=1),
+            )
+            rows = np.arange(len(x))
+            ret.extend(
+                NaryFraction._trusted(d, int(p), int(r), visual_settings)
+                for p, r in zip(numerators[rows, choice], denominators[rows, choice])
             )
-            new_error = abs(point.to_float() - x)
-            if new_error < error:
-                best_approximation = point
+        return ret
+
+    @staticmethod
+    def _reduced(numerator: int, denominator: int) -> Tuple[int, int]:
+        numerator %= denominator
+        common = math.gcd(numerator, denominator)
+        return numerator // common, denominator // common
+
+    @staticmethod
+    def from_ratio(numerator: int, denominator: int, degree: Degree) -> "NaryFraction":
+        "the angle numerator/denominator (taken modulo 1)"
+        return NaryFraction._trusted(
+            degree,
+            *NaryFraction._reduced(numerator, denominator),
+            DEFAULT_VISUAL_SETTINGS,
+        )
+
+    @staticmethod
+    def _pre_period_and_period(denominator: int, degree: Degree) -> Tuple[int, int]:
+        """the lengths of the exact and repeating digits of a reduced fraction with
+        this denominator"""
+        # the pre-period is the number of times factors of the degree are removed
+        coprime_part = denominator
+        pre_period = 0
+        common = math.gcd(coprime_part, degree)
+        while common > 1:
+            coprime_part //= common
+            pre_period += 1
+            common = math.gcd(coprime_part, degree)
+        if coprime_part == 1:
+            # zero is written _0
+            return pre_period, 1 if pre_period == 0 else 0
+        # the period is the order of the degree modulo the rest
+        period = 1
+        power = degree % coprime_part
+        while power != 1:
+            power = power * degree % coprime_part
+            period += 1
+        return pre_period, period
 
-        return best_approximation
+    @staticmethod
+    def _ratio_to_digits(
+        numerator: int, denominator: int, degree: Degree
+    ) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        "the canonical digits of a reduced fraction, found by long division"
+        pre_period, period = NaryFraction._pre_period_and_period(denominator, degree)
+        digits = []
+        for _ in range(pre_period + period):
+            numerator *= degree
+            digits.append(numerator // denominator)
+            numerator %= denominator
+        return tuple(digits[:pre_period]), tuple(digits[pre_period:])
 
     def to_float(self) -> float:
-        return NaryFraction._cached_to_float(self.degree, self.exact, self.repeating)
+        numerator, denominator = self._ratio
+        return numerator / denominator
 
-    def to_fraction(self) -> str:
+    @staticmethod
+    def _to_ratio(
+        degree: Degree, exact: Sequence[int], repeating: Sequence[int]
+    ) -> Tuple[int, int]:
+        "the reduced numerator and denominator"
         numerator = 0
         denominator = 1
 
         # Handle the exact part
-        for i, digit in enumerate(self.exact):
-            numerator = numerator * self.degree + digit
-            denominator *= self.degree
+        for digit in exact:
+            numerator = numerator * degree + digit
+            denominator *= degree
 
         # Handle the repeating part
-        if len(self.repeating) > 0:
+        if len(repeating) > 0:
             repeat_numerator = 0
-            for digit in self.repeating:
-                repeat_numerator = repeat_numerator * self.degree + digit
+            for digit in repeating:
+                repeat_numerator = repeat_numerator * degree + digit
 
-            repeat_denominator = self.degree ** len(self.repeating) - 1
+            repeat_denominator = degree ** len(repeating) - 1
 
             # Combine exact and repeating parts
             numerator = numerator * repeat_denominator + repeat_numerator
             denominator *= repeat_denominator
 
-        # Simplify the fraction
-        from math import gcd
-
-        common_divisor = gcd(numerator, denominator)
-        numerator //= common_divisor
-        denominator //= common_divisor
+        common_divisor = math.gcd(numerator, denominator)
+        return numerator // common_divisor, denominator // common_divisor
 
+    def to_fraction(self) -> str:
+        numerator, denominator = self._ratio
         return f"{numerator}/{denominator}"
 
     def pre_period(self) -> int:
-        return len(self.exact)
+        return NaryFraction._pre_period_and_period(self._ratio[1], self.degree)[0]
 
     def period(self) -> Optional[int]:
         if self.periodic():
-            return len(self.repeating)
+            return NaryFraction._pre_period_and_period(self._ratio[1], self.degree)[1]
         return None
 
     def periodic(self) -> bool:
-        return self.pre_period() == 0
+        return math.gcd(self._ratio[1], self.degree) == 1
 
     def periodic_iterate(self) -> "NaryFraction":
         return NaryFraction(
@@ -443,7 +721,9 @@ class LiftedAngle(_Angle, BaseModel):
 
     value: float
 
-    def __init__(self, value: float, degree: Degree, visual_settings=VisualSettings()):
+    def __init__(
+        self, value: float, degree: Degree, visual_settings=DEFAULT_VISUAL_SETTINGS
+    ):
         super(LiftedAngle, self).__init__(
             value=value, degree=degree, visual_settings=visual_settings
         )
@@ -452,10 +732,12 @@ class LiftedAngle(_Angle, BaseModel):
         return FloatWrapper(self.value % 1, self.degree, self.visual_settings)
 
     def after_sigma(self) -> "LiftedAngle":
-        after = deepcopy(self)
         assert self.degree is not None
-        after.value *= self.degree
-        return after
+        return LiftedAngle.model_construct(
+            value=self.value * self.degree,
+            degree=self.degree,
+            visual_settings=self.visual_settings,
+        )
 
     def centered(self, center: _Angle) -> "LiftedAngle":
         # https://www.desmos.com/calculator/jrc4g7ljum
@@ -476,25 +758,317 @@ class LiftedAngle(_Angle, BaseModel):
     def pre_images(self) -> List["LiftedAngle"]:
         assert self.degree is not None
         return [
-            LiftedAngle(
-                self.value / self.degree + digit / self.degree,
-                self.degree,
+            LiftedAngle.model_construct(
+                value=(self.value + digit) / self.degree,
+                degree=self.degree,
                 visual_settings=self.visual_settings,
             )
             for digit in range(self.degree)
         ]
 
 
+class InternTable:
+    """A bounded table of the NaryFraction instances shared by NaryFraction.interned,
+    keyed on (degree, numerator, denominator) of the reduced ratio. The least
+    recently used entries are evicted once maxsize is reached."""
+
+    def __init__(self, maxsize: int = 1 << 16):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._table: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def get(self, key: tuple) -> Optional["NaryFraction"]:
+        ret = self._table.get(key)
+        if ret is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._table.move_to_end(key)
+        return ret
+
+    def add(self, key: tuple, point: "NaryFraction"):
+        self._table[key] = point
+        if len(self._table) > self.maxsize:
+            self._table.popitem(last=False)
+
+    def clear(self):
+        self._table.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+intern_table = InternTable()
+
+
 Angle = Union[NaryFraction, FloatWrapper, LiftedAngle]
 PrincipalAngle = Union[NaryFraction, FloatWrapper]
 
+
+class AngleArray:
+    """Many principal angles of one degree stored as parallel NumPy arrays, so that
+    sigma, pre-images and float conversion run over all of them at once.
+
+    Each entry is exact when its denominator is positive, and is then the rational
+    numerators/denominators. Entries with a zero denominator (from FloatWrapper) are
+    only known through values. Rationals whose denominator is too large for sigma
+    to stay within int64 have a denominator of -1, and their (numerator,
+    denominator) as Python ints in the side table large, which is None while there
+    are none.
+    """
+
+    def __init__(
+        self,
+        numerators: np.ndarray,
+        denominators: np.ndarray,
+        values: np.ndarray,
+        degree: Degree,
+        large: Optional[np.ndarray] = None,
+    ):
+        self.numerators = numerators
+        self.denominators = denominators
+        self.values = values
+        self.degree = degree
+        self.large = large
+
+    @staticmethod
+    def _limit(degree: Degree) -> int:
+        "the largest denominator for which sigma can not overflow"
+        return np.iinfo(np.int64).max // degree
+
+    @staticmethod
+    def from_angles(angles: Iterable[Angle], degree: Degree) -> "AngleArray":
+        numerators, denominators, values = [], [], []
+        positions, ratios = [], []
+        for angle in angles:
+            if isinstance(angle, NaryFraction):
+                positions.append((len(values),))
+                ratios.append(angle._ratio)
+            numerators.append(0)
+            denominators.append(0)
+            values.append(angle.to_float() % 1)
+        return AngleArray._with_ratios(
+            np.array(numerators, dtype=np.int64),
+            np.array(denominators, dtype=np.int64),
+            np.array(values, dtype=np.float64),
+            degree,
+            positions,
+            ratios,
+        )
+
+    @staticmethod
+    def _with_ratios(
+        numerators: np.ndarray,
+        denominators: np.ndarray,
+        values: np.ndarray,
+        degree: Degree,
+        positions: Sequence[Tuple[int, ...]],
+        ratios: Sequence[Tuple[int, int]],
+    ) -> "AngleArray":
+        """the array of the given columns with the reduced ratios written in at the
+        positions, in the side table if they are too large for int64"""
+        limit = AngleArray._limit(degree)
+        large = None
+        for position, (numerator, denominator) in zip(positions, ratios):
+            values[position] = numerator / denominator
+            if denominator <= limit:
+                numerators[position] = numerator
+                denominators[position] = denominator
+                continue
+            if large is None:
+                large = np.full(values.shape, None, dtype=object)
+            numerators[position] = 0
+            denominators[position] = -1
+            large[position] = (numerator, denominator)
+        return AngleArray(numerators, denominators, values, degree, large)
+
+    def _ratio_at(self, position: Tuple[int, ...]) -> Tuple[int, int]:
+        "the ratio of the exact entry at position"
+        denominator = int(self.denominators[position])
+        if denominator < 0:
+            return self.large[position]  # type: ignore
+        return int(self.numerators[position]), denominator
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.values.shape
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def exact(self) -> np.ndarray:
+        return self.denominators != 0
+
+    def _select(self, index) -> "AngleArray":
+        return AngleArray(
+            self.numerators[index],
+            self.denominators[index],
+            self.values[index],
+            self.degree,
+            None if self.large is None else self.large[index],
+        )
+
+    def __getitem__(self, index) -> Union["AngleArray", PrincipalAngle]:
+        if np.ndim(self.values[index]) > 0:
+            return self._select(index)
+        if self.denominators[index] != 0:
+            return NaryFraction.from_ratio(*self._ratio_at(index), self.degree)
+        return FloatWrapper(float(self.values[index]), self.degree)
+
+    def to_angles(self) -> List[PrincipalAngle]:
+        "converts back into angle objects; only flat arrays are supported"
+        assert self.values.ndim == 1
+        return [self[i] for i in range(len(self))]  # type: ignore
+
+    def to_float(self) -> np.ndarray:
+        return self.values
+
+    def to_angle(self) -> np.ndarray:
+        return self.values * 2 * pi
+
+    def to_cartesian(self) -> np.ndarray:
+        "an array of the shape of self with a trailing axis of length 3"
+        angles = self.to_angle()
+        return np.stack([np.cos(angles), np.sin(angles), np.zeros_like(angles)], -1)
+
+    def after_sigma(self) -> "AngleArray":
+        exact = self.denominators > 0
+        denominators = np.where(exact, self.denominators, 1)
+        numerators = np.where(exact, self.numerators * self.degree % denominators, 0)
+        values = np.where(
+            exact, numerators / denominators, self.values * self.degree % 1
+        )
+        # the side table is done one entry at a time, with Python ints
+        positions = list(zip(*np.nonzero(self.denominators < 0)))
+        ratios = [
+            NaryFraction._reduced(p * self.degree, q)
+            for p, q in map(self._ratio_at, positions)
+        ]
+        return AngleArray._with_ratios(
+            numerators, self.denominators.copy(), values, self.degree, positions, ratios
+        )
+
+    def pre_images(self) -> "AngleArray":
+        "an array with a trailing axis of length degree holding the pre-images"
+        d = self.degree
+        digits = np.arange(d, dtype=np.int64)
+        small = (self.denominators > 0) & (
+            self.denominators <= AngleArray._limit(d) // d
+        )
+        exact = small[..., None]
+        denominators = np.where(exact, self.denominators[..., None], 1)
+        numerators = np.where(
+            exact, self.numerators[..., None] + digits * denominators, 0
+        )
+        denominators = denominators * d
+        common = np.gcd(numerators, denominators)
+        numerators = numerators // common
+        denominators = np.where(exact, denominators // common, 0)
+        values = np.where(
+            exact,
+            numerators / np.maximum(denominators, 1),
+            (self.values[..., None] + digits) / d,
+        )
+        # exact entries whose pre-images could overflow int64 are done with Python
+        # ints, and stay in the side table if they are still too large
+        positions, ratios = [], []
+        for position in zip(*np.nonzero(self.exact() & ~small)):
+            p, q = self._ratio_at(position)
+            for digit in range(d):
+                positions.append(position + (digit,))
+                ratios.append(NaryFraction._reduced(p + digit * q, q * d))
+        return AngleArray._with_ratios(
+            numerators, denominators, values, d, positions, ratios
+        )
+
+    def argsort(self) -> np.ndarray:
+        return np.argsort(self.values, kind="stable")
+
+    def sorted(self) -> "AngleArray":
+        "sorted by float value; only flat arrays are supported"
+        assert self.values.ndim == 1
+        return self._select(self.argsort())
+
+
+class Orbit:
+    """The forward orbit of a NaryFraction: the pre-periodic tail, starting with the
+    point itself, followed by the cycle it falls into. The iterates are looked up,
+    not recomputed, so sigma^k and membership are O(1)."""
+
+    def __init__(self, tail: Tuple[NaryFraction, ...], cycle: Tuple[NaryFraction, ...]):
+        self.tail = tail
+        self.cycle = cycle
+        self._index = {}
+        for i, point in enumerate(tail + cycle):
+            self._index.setdefault(point, i)
+
+    def __len__(self) -> int:
+        "the number of distinct points"
+        return len(self.tail) + len(self.cycle)
+
+    def __iter__(self):
+        return iter(self.tail + self.cycle)
+
+    def __contains__(self, point) -> bool:
+        return point in self._index
+
+    def iterate(self, k: int) -> NaryFraction:
+        "sigma^k of the first point"
+        if k < len(self.tail):
+            return self.tail[k]
+        return self.cycle[(k - len(self.tail)) % len(self.cycle)]
+
+    def index(self, point: NaryFraction) -> int:
+        "the least k such that sigma^k of the first point is point"
+        if point not in self._index:
+            raise ValueError("{} is not in the orbit".format(point))
+        return self._index[point]
+
+
+def orbit(angle: NaryFraction) -> Orbit:
+    """The orbit of angle, whose points have the visual settings of angle, as
+    after_sigma would give them. Orbits of points with the default visual settings
+    are shared."""
+    assert isinstance(angle, NaryFraction), "only exact points have finite orbits"
+    ret = _orbit(int(angle.degree), *angle._ratio)
+    if _is_default_style(angle.visual_settings):
+        return ret
+
+    def styled(points: Tuple[NaryFraction, ...]) -> Tuple[NaryFraction, ...]:
+        return tuple(
+            NaryFraction._trusted(p.degree, *p._ratio, angle.visual_settings)
+            for p in points
+        )
+
+    return Orbit(styled(ret.tail), styled(ret.cycle))
+
+
+@lru_cache(maxsize=1 << 12)
+def _orbit(degree: int, numerator: int, denominator: int) -> Orbit:
+    pre_period, period = NaryFraction._pre_period_and_period(denominator, degree)
+    # the orbits of points with finite expansions end at zero
+    period = max(period, 1)
+    points = [NaryFraction.from_ratio(numerator, denominator, degree)]
+    for _ in range(pre_period + period - 1):
+        points.append(points[-1].after_sigma())
+    return Orbit(tuple(points[:pre_period]), tuple(points[pre_period:]))
+
+
+def in_forward_orbit(x: NaryFraction, y: NaryFraction) -> bool:
+    "whether sigma^k(y) = x for some k >= 0"
+    return x.degree == y.degree and x in orbit(y)
+
+
 T = TypeVar("T")
 
 
 def sigma(input: T) -> T:
     if isinstance(input, Tuple):
         return tuple(
-            sorted(set([p.after_sigma() for p in input]), key=lambda p: p.to_float())
+            sorted(set([p.after_sigma() for p in input]), key=lambda p: p.sort_key)
         )  # type: ignore
     if isinstance(input, List):
         return [x.after_sigma() for x in input]
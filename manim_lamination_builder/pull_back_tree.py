@@ -1,4 +1,6 @@
-from typing import List, cast
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable, Iterator, List, Optional, Tuple, cast
 from manim import DOWN, LEFT, ORIGIN, RIGHT, UP, DiGraph, Scene, Group, Text, config, np
 from manim.mobject.graph import LayoutFunction
 import networkx as nx
@@ -12,7 +14,69 @@ from manim_lamination_builder.lamination import (
     LeafLamination,
     GapLamination,
 )
-from manim_lamination_builder.new_generate import next_pull_back
+from manim_lamination_builder.new_generate import iter_pull_backs, next_pull_back
+from manim_lamination_builder.points import Angle, NaryFraction
+
+# laminations are sent to and from worker processes with each NaryFraction
+# reduced to its ratio and style, and the polygons trusted on the way back
+
+
+def _angle_payload(angle: Angle):
+    if isinstance(angle, NaryFraction):
+        return (angle._ratio[0], angle._ratio[1], angle.visual_settings)
+    return angle
+
+
+def _angle_from_payload(payload, degree: int) -> Angle:
+    if isinstance(payload, tuple):
+        return NaryFraction._trusted(degree, *payload)
+    return payload
+
+
+def _lamination_payload(lam: GapLamination):
+    return (
+        lam.degree,
+        [tuple(map(_angle_payload, polygon)) for polygon in lam.polygons],
+        [_angle_payload(p) for p in lam.points],
+    )
+
+
+def _lamination_from_payload(payload) -> GapLamination:
+    degree, polygons, points = payload
+    return GapLamination._trusted(
+        [
+            tuple(_angle_from_payload(p, degree) for p in polygon)
+            for polygon in polygons
+        ],
+        [_angle_from_payload(p, degree) for p in points],
+        degree,
+    )
+
+
+def _tree_payload(tree: "PullBackTree"):
+    return (
+        _lamination_payload(tree.node),
+        [_tree_payload(child) for child in tree.children],
+    )
+
+
+def _tree_from_payload(payload) -> "PullBackTree":
+    node, children = payload
+    return PullBackTree(
+        node=_lamination_from_payload(node),
+        children=[_tree_from_payload(child) for child in children],
+    )
+
+
+def _build_in_worker(payload, depth: int):
+    return _tree_payload(PullBackTree.build(_lamination_from_payload(payload), depth))
+
+
+def _next_pull_back_in_worker(payload):
+    return [
+        _lamination_payload(child)
+        for child in next_pull_back(_lamination_from_payload(payload))
+    ]
 
 
 class PullBackTree(BaseModel):
@@ -20,8 +84,14 @@ class PullBackTree(BaseModel):
     children: List["PullBackTree"]
 
     @staticmethod
-    def build(lam: AbstractLamination, depth: int) -> "PullBackTree":
+    def build(
+        lam: AbstractLamination, depth: int, workers: Optional[int] = None
+    ) -> "PullBackTree":
+        """With more than one worker, the first levels are built here until there
+        are a few subtrees per worker, which are then built in worker processes."""
         node = lam.to_polygons()
+        if workers is not None and workers > 1:
+            return PullBackTree._build_in_parallel(node, depth, workers)
         if depth == 0:
             children = []
             return PullBackTree(node=node, children=[])
@@ -31,12 +101,103 @@ class PullBackTree(BaseModel):
         )
         return PullBackTree(node=node, children=children)
 
-    def extend_by_one_level(self) -> "PullBackTree":
+    @staticmethod
+    def _build_in_parallel(
+        node: GapLamination, depth: int, workers: int
+    ) -> "PullBackTree":
+        tree = PullBackTree(node=node, children=[])
+        frontier = [tree]
+        # the last level is always left to the workers
+        while depth > 1 and 0 < len(frontier) < 4 * workers:
+            for leaf in frontier:
+                leaf.children = [
+                    PullBackTree(node=child, children=[])
+                    for child in next_pull_back(leaf.node)
+                ]
+            frontier = [child for leaf in frontier for child in leaf.children]
+            depth -= 1
+        if depth > 0 and len(frontier) > 0:
+            payloads = [_lamination_payload(leaf.node) for leaf in frontier]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # map keeps the order of the frontier
+                subtrees = pool.map(_build_in_worker, payloads, repeat(depth))
+                for leaf, subtree in zip(frontier, subtrees):
+                    leaf.children = _tree_from_payload(subtree).children
+        return tree
+
+    @staticmethod
+    def walk(
+        start: AbstractLamination, depth: int
+    ) -> Iterator[Tuple[int, GapLamination]]:
+        """
+        Yields (generation, lamination) for each node of the tree that build would
+        make, parents before children and in the order of flatten within each
+        generation, without making the tree. Only the pull backs still to be visited
+        along the current path are kept.
+        """
+        path = [iter([start.to_polygons()])]
+        while len(path) > 0:
+            lam = next(path[-1], None)
+            if lam is None:
+                path.pop()
+                continue
+            generation = len(path) - 1
+            yield (generation, lam)
+            if generation < depth:
+                path.append(iter_pull_backs(lam))
+
+    @staticmethod
+    def iter_generation(start: AbstractLamination, n: int) -> Iterator[GapLamination]:
+        "the laminations of flatten()[n] of the tree of start, one at a time"
+        for generation, lam in PullBackTree.walk(start, n):
+            if generation == n:
+                yield lam
+
+    @staticmethod
+    def write_generation(start: AbstractLamination, n: int, path: str) -> int:
+        """
+        Writes generation n to path as it is found, as a JSON list that
+        read_file_to_laminations can read back, and returns how many there were.
+        """
+        from manim_lamination_builder.custom_json import custom_dump
+
+        count = 0
+        with open(path, "w") as f:
+            f.write("[")
+            for lam in PullBackTree.iter_generation(start, n):
+                f.write(",\n" if count > 0 else "\n")
+                f.write(custom_dump(lam))
+                count += 1
+            f.write("\n]\n")
+        return count
+
+    def leaves(self) -> List["PullBackTree"]:
+        "the subtrees without children, from left to right"
+        if not self.children:
+            return [self]
+        return [leaf for child in self.children for leaf in child.leaves()]
+
+    def extend_by_one_level(self, workers: Optional[int] = None) -> "PullBackTree":
+        if workers is None or workers <= 1:
+            return self._extended(next_pull_back)
+        payloads = [_lamination_payload(leaf.node) for leaf in self.leaves()]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_next_pull_back_in_worker, payloads))
+        pull_backs: Iterator[List[GapLamination]] = (
+            [_lamination_from_payload(child) for child in children]
+            for children in results
+        )
+        # the leaves are reached in the same order as by leaves()
+        return self._extended(lambda node: next(pull_backs))
+
+    def _extended(
+        self, pull_back: Callable[[GapLamination], List[GapLamination]]
+    ) -> "PullBackTree":
         if not self.children:
-            new_children = next_pull_back(self.node)
+            new_children = pull_back(self.node)
             children = [PullBackTree(node=child, children=[]) for child in new_children]
         else:
-            children = [child.extend_by_one_level() for child in self.children]
+            children = [child._extended(pull_back) for child in self.children]
 
         return PullBackTree(node=self.node, children=children)
 
@@ -70,9 +231,10 @@ class PullBackTree(BaseModel):
             G.add_node(i)
             table.append(L.to_polygons())
 
+        criticality = [L.trapped_criticality() for L in table]
         for i, a in enumerate(table):
             for j, b in enumerate(table):
-                if a.trapped_criticality() + 1 == b.trapped_criticality():
+                if criticality[i] + 1 == criticality[j]:
                     if a.finer(b):
                         G.add_edge(i, j)
         return (G, table)
@@ -102,7 +102,6 @@ from manim import (
     CubicBezier,
 )
 from manim.animation.animation import config
-from manim.mobject.geometry.arc import itertools
 from manim_lamination_builder import (
     Chord,
     FloatWrapper,
@@ -138,14 +137,9 @@ def get_convexity(in_list: List[Angle]) -> Optional[List[LiftedAngle]]:
 class CheatingPinch(Scene):
     def __init__(self, lamination: GapLamination):
         def change_color(p):
-            p.visual_settings.stroke_width = 2
-            return p
+            return p.restyled(stroke_width=2)
 
         self.lamination = lamination.apply_function(change_color)
-        self.all_vertecies_sorted = sorted(
-            itertools.chain.from_iterable(self.lamination.polygons),
-            key=lambda p: p.to_float(),
-        )
         #  corresponds to its first ccw edge in the sorted or convex list
         self.initial_curves = []
         self.destination_curves = []
@@ -190,10 +184,7 @@ class CheatingPinch(Scene):
                 polygon_sorted
             )
 
-            broad_index = self.all_vertecies_sorted.index(p.principal())
-            next_p = self.all_vertecies_sorted[
-                (broad_index + 1) % len(self.all_vertecies_sorted)
-            ]
+            next_p = self.lamination.next_vertex(p.principal())
             bigness = (next_p.to_float() - p.to_float()) % 1
 
             self.add_initial_curve(p, next_p)
@@ -213,9 +204,7 @@ class CheatingPinch(Scene):
                     stroke_width=2,
                 )
             else:
-                adjacent_polygon = next(
-                    filter(lambda poly: next_p in poly, self.lamination.polygons)
-                )
+                adjacent_polygon = self.lamination.polygon_of(next_p)
                 angle_of_this_cut_point_from_other = (
                     self.angle_of_last_fatu_gap_rotaitions(adjacent_polygon)
                     + list(
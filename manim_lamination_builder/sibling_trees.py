@@ -12,9 +12,9 @@ from manim_lamination_builder import (
 
 def first_polygon(lam: GapLamination) -> List[Angle]:
     "select first polygon CCW"
-    sorted_points = sorted(lam.points, key=lambda x: x.to_float())
+    sorted_points = sorted(lam.points, key=lambda x: x.sort_key)
     for p in sorted_points:
-        polygon = next(filter(lambda lst: p in lst, lam.polygons), None)
+        polygon = lam.polygon_of(p)
         if polygon is not None:
             return polygon
     assert False, "There were no plygons and you asked for the first of them."
@@ -28,7 +28,7 @@ def make_regions(lam: OccludedLamination) -> List[OccludedLamination]:
 
     regions = []
     n = len(polygon)
-    sorted_polygon = sorted(polygon, key=lambda x: x.to_float())
+    sorted_polygon = sorted(polygon, key=lambda x: x.sort_key)
     sorted_polygon.append(lam.occlusion.a if lam.occlusion else sorted_polygon[0])
     for i in range(n):
         chord = HalfOpenArc(sorted_polygon[i + 1], sorted_polygon[i], None)
@@ -1,6 +1,7 @@
 from manim.utils.color.core import ManimColor
 from manim import RED, BLACK, BLUE_C, GREEN, BLUE, YELLOW, PURPLE, WHITE
 from pydantic import BaseModel, ConfigDict
+from typing import Dict
 
 colors_list = [RED, GREEN, BLUE, YELLOW, PURPLE]
 
@@ -13,13 +14,32 @@ def get_color(i: int):
 
 
 class VisualSettings(BaseModel):
+    """How a point (and the leaves and polygons it starts) is drawn. Instances are
+    immutable so that every point can share one from the palette instead of
+    carrying its own copy; use restyled to get a variation."""
+
     point_color: ManimColor = RED
     stroke_color: ManimColor = BLACK
     polygon_color: ManimColor = BLUE_C
     point_size: float = 0.04
     stroke_width: float = 2
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
 
     @staticmethod
     def default():
-        return VisualSettings()
+        return DEFAULT_VISUAL_SETTINGS
+
+    def _key(self) -> tuple:
+        return tuple(str(v) for v in self.__dict__.values())
+
+    def shared(self) -> "VisualSettings":
+        "the palette's instance equal to self"
+        return palette.setdefault(self._key(), self)
+
+    def restyled(self, **changes) -> "VisualSettings":
+        return VisualSettings(**{**self.__dict__, **changes}).shared()
+
+
+# every distinct style in use, so points styled alike reference one object
+palette: Dict[tuple, VisualSettings] = {}
+DEFAULT_VISUAL_SETTINGS = VisualSettings().shared()
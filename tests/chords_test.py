@@ -1,4 +1,11 @@
 from manim_lamination_builder import Chord, NaryFraction
+from manim_lamination_builder.chord import (
+    CrossingIndex,
+    chord_endpoints,
+    crossing_counts,
+    crossing_matrix,
+    first_crossing,
+)
 
 def test_chords():
     a, b, c, d = tuple(NaryFraction.from_string(4, "0_0").pre_images())
@@ -11,3 +18,32 @@ def test_chords():
     assert Chord(NaryFraction.from_string(4, "0_0"), b) in [
         Chord(NaryFraction.from_string(4, "0_0"), b)
     ]
+
+
+def test_first_crossing():
+    a, b, c, d = tuple(NaryFraction.from_string(4, "0_0").pre_images())
+    assert first_crossing([Chord(a, b), Chord(c, d), Chord(a, d)]) is None
+    assert first_crossing([Chord(a, b), Chord(b, c), Chord(a, c)]) is None
+    pair = first_crossing([Chord(a, b), Chord(a, c), Chord(b, d)])
+    assert pair is not None and set(pair) == {Chord(a, c), Chord(b, d)}
+
+
+def test_crossing_index():
+    a, b, c, d = tuple(NaryFraction.from_string(4, "0_0").pre_images())
+    index = CrossingIndex([Chord(a, c)])
+    assert index.crosses(Chord(b, d)) and not index.crosses(Chord(a, b))
+    index.add(Chord(a, b))
+    assert index.unlinked and not index.crosses(Chord(c, d))
+    index.add(Chord(b, d))
+    assert not index.unlinked and index.crosses(Chord(a, c))
+
+
+def test_crossing_matrix():
+    a, b, c, d = tuple(NaryFraction.from_string(4, "0_0").pre_images())
+    first = [Chord(a, c), Chord(a, b)]
+    second = [Chord(b, d), Chord(c, d), Chord(a, c)]
+    expected = [[chord.crosses(other) for other in second] for chord in first]
+    endpoints = chord_endpoints(first), chord_endpoints(second)
+    assert crossing_matrix(*endpoints).tolist() == expected
+    assert crossing_matrix(*endpoints, chunk_size=1).tolist() == expected
+    assert crossing_counts(*endpoints, chunk_size=1).tolist() == [1, 0]
@@ -0,0 +1,68 @@
+from manim_lamination_builder import (
+    ColumnarLamination,
+    LeafLamination,
+    NaryFraction,
+    parse_lamination,
+)
+from manim_lamination_builder.points import LiftedAngle
+
+
+def test_columnar_matches_gap_lamination():
+    lam = parse_lamination(
+        """{polygons:[['_100','_010','_001'],['1_100','1_010','0_001'],['_01','_10']],
+        degree:2}"""
+    ).to_polygons()
+    columnar = ColumnarLamination.from_lamination(lam)
+    assert len(columnar) == 3
+    assert columnar.polygons == lam.polygons
+    assert columnar.after_sigma().polygons == lam.after_sigma().polygons
+    assert columnar.to_leafs().to_leaf_lamination().leafs == lam.to_leafs().leafs
+
+    def f(p):
+        return p.to_float() < 0.5
+
+    assert columnar.filtered(f).polygons == lam.filtered(f).polygons
+
+    def g(p):
+        return p.pre_images()[1]
+
+    assert columnar.apply_function(g).polygons == lam.apply_function(g).polygons
+
+
+def test_columnar_leaf_lamination():
+    leaves = parse_lamination(
+        """{polygons:[['_100','_010','_001'],['_01','_10']], degree:2}"""
+    ).to_leafs()
+    columnar = ColumnarLamination.from_lamination(leaves)
+    assert columnar.leafs and len(columnar) == 4
+    assert columnar.to_leaf_lamination().leafs == leaves.leafs
+    assert sorted(columnar.to_polygons().polygons) == sorted(
+        leaves.to_polygons().polygons
+    )
+
+
+def test_columnar_keeps_leaf_lamination_settings():
+    leaves = parse_lamination(
+        """{polygons:[['_100','_010','_001'],['_01','_10']], degree:2}"""
+    ).to_leafs()
+    not_q = LeafLamination(
+        leafs=leaves.leafs, points=[], degree=2, as_q_lamination=False
+    )
+    columnar = ColumnarLamination.from_lamination(not_q)
+    assert not columnar.to_leaf_lamination().as_q_lamination
+    assert len(columnar.to_polygons().polygons) == len(not_q.leafs)
+    assert len(columnar.after_sigma().to_polygons().polygons) == len(not_q.leafs)
+
+    lifted = ColumnarLamination.from_lamination(leaves).lifted()
+    assert lifted == leaves.lifted()
+    assert all(isinstance(leaf.min, LiftedAngle) for leaf in lifted.leafs)
+
+
+def test_columnar_keeps_long_periods_exact():
+    point = NaryFraction.from_string(2, "_" + "0" * 69 + "1")
+    lam = parse_lamination("""{polygons:[['_01','_10']], degree:2}""").to_polygons()
+    lam.polygons.append((point, point.after_sigma()))
+    columnar = ColumnarLamination.from_lamination(lam)
+    assert all(isinstance(p, NaryFraction) for p in columnar.polygons[1])
+    assert columnar.to_gap_lamination().fingerprint() == lam.fingerprint()
+    assert columnar.after_sigma().polygons == lam.after_sigma().polygons
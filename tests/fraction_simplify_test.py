@@ -16,6 +16,11 @@ def test_over_specified_repeating_part():
     assert fraction.repeating == (1, 0, 1)
     fraction = NaryFraction(degree=4, exact=(), repeating=(2, 2, 2))
     assert fraction.repeating == (2,)
+    # digits that don't fit in one character
+    fraction = NaryFraction(degree=12, exact=(), repeating=(10, 11, 10, 11))
+    assert fraction.repeating == (10, 11)
+    fraction = NaryFraction(degree=12, exact=(), repeating=(1, 11, 1, 1))
+    assert fraction.repeating == (1, 11, 1, 1)
 
 
 def test_repeating_d_minus_1_in_base_d():
@@ -26,6 +31,9 @@ def test_repeating_d_minus_1_in_base_d():
     fraction = NaryFraction(degree=3, exact=(2, 1), repeating=(2,))
     assert fraction.exact == (2, 2)
     assert fraction.repeating == ()
+    fraction = NaryFraction(degree=2, exact=(0, 1, 1), repeating=(1,))
+    assert fraction.exact == (1,)
+    assert fraction.repeating == ()
 
 
 def test_trailing_zeroes():
@@ -46,3 +54,18 @@ def test_form_of_zero():
 
 # TODO: test if the period of a point always matches the length of reapeating part
 # using a test
+
+
+def test_sigma_and_pre_images_stay_canonical():
+    # after_sigma and pre_images skip validation, so compare with the validated path
+    for string in ["_0", "1", "01", "_01", "1_01", "_011", "20_1", "0_012"]:
+        point = NaryFraction.from_string(3, string)
+        image = point.after_sigma()
+        validated = NaryFraction(degree=3, exact=image.exact, repeating=image.repeating)
+        assert (image.exact, image.repeating) == (validated.exact, validated.repeating)
+        for digit, pre_image in enumerate(point.pre_images()):
+            validated = NaryFraction(
+                degree=3, exact=(digit,) + point.exact, repeating=point.repeating
+            )
+            assert pre_image.exact == validated.exact
+            assert pre_image.repeating == validated.repeating
@@ -0,0 +1,91 @@
+from manim_lamination_builder import (
+    Chord,
+    FloatWrapper,
+    GapLamination,
+    LeafLamination,
+    NaryFraction,
+    parse_lamination,
+)
+
+
+def test_gap_lamination_vertex_index():
+    lam = parse_lamination(
+        """{polygons:[['_100','_010','_001'],['_01','_10']], degree:2}"""
+    ).to_polygons()
+    digon = lam.polygons[1]
+    for polygon in lam.polygons:
+        for vertex in polygon:
+            assert lam.polygon_of(vertex) == polygon
+            assert lam.contains(FloatWrapper(vertex.to_float(), 2))
+    assert lam.polygon_of(NaryFraction.from_string(2, "0")) is None
+    assert not lam.contains(NaryFraction.from_string(2, "0"))
+    one_seventh, one_third = NaryFraction.from_string(2, "_001"), digon[0]
+    assert lam.next_vertex(NaryFraction.from_string(2, "0")) == one_seventh
+    assert lam.next_vertex(one_seventh) == NaryFraction.from_string(2, "_010")
+    assert lam.next_vertex(digon[1]) == one_seventh
+    assert lam.next_vertex(NaryFraction.from_string(2, "_010")) == one_third
+    # replacing a polygon keeps the number of them
+    lam.polygons[1] = (FloatWrapper(0.0, 2), FloatWrapper(0.5, 2))
+    assert lam.polygon_of(one_third) is None
+    assert lam.polygon_of(FloatWrapper(0.5, 2)) == lam.polygons[1]
+
+
+def test_crossing_index_follows_leafs():
+    a, b, c, d = tuple(NaryFraction.from_string(4, "0_0").pre_images())
+    lam = LeafLamination(leafs={Chord(a, b)}, points=[], degree=4)
+    assert not lam.crosses(Chord(b, d))
+    # the same number of leafs, but not the same leafs
+    lam.leafs.clear()
+    lam.leafs.add(Chord(a, c))
+    assert lam.crosses(Chord(b, d))
+    lam.push_leaf(Chord(a, b))
+    assert lam.unlinked()
+    lam.leafs.discard(Chord(a, c))
+    lam.leafs.add(Chord(b, d))
+    assert not lam.crosses(Chord(a, b)) and lam.crosses(Chord(a, c))
+
+
+def test_fingerprint():
+    text = """{polygons:[['_100','_010','_001'],['_01','_10']], degree:2}"""
+    lam = parse_lamination(text).to_polygons()
+    shuffled = GapLamination(
+        polygons=[lam.polygons[1], tuple(reversed(lam.polygons[0]))],
+        points=[],
+        degree=2,
+    )
+    assert lam == shuffled and hash(lam) == hash(shuffled)
+    assert len({lam, shuffled}) == 1
+    assert lam != parse_lamination(text.replace("2}", "3}")).to_polygons()
+    lam.polygons.append((FloatWrapper(0.0, 2), FloatWrapper(0.5, 2)))
+    assert lam != shuffled
+    before = lam.fingerprint()
+
+    leafs = lam.to_leafs()
+    leafs_before = leafs.fingerprint()
+    assert leafs == leafs.branch()
+    leafs.push_leaf(Chord(FloatWrapper(0.0, 2), FloatWrapper(0.25, 2)))
+    assert leafs.fingerprint() != leafs_before
+    leafs.pop_leaf()
+    assert leafs.fingerprint() == leafs_before
+    # the same number of leafs, but not the same leafs
+    leafs.leafs.remove(Chord(FloatWrapper(0.0, 2), FloatWrapper(0.5, 2)))
+    leafs.leafs.add(Chord(FloatWrapper(0.0, 2), FloatWrapper(0.25, 2)))
+    assert leafs.fingerprint() != leafs_before
+
+    # the same number of polygons, but not the same polygons
+    lam.polygons[-1] = (FloatWrapper(0.0, 2), FloatWrapper(0.25, 2))
+    assert lam.fingerprint() != before
+    # the points are not compared
+    moved = GapLamination(polygons=lam.polygons, points=[lam.polygons[0][0]], degree=2)
+    assert lam == moved
+
+
+def test_trapped_criticality_follows_polygons():
+    lam = parse_lamination("""{polygons:[['_01','_10']], degree:2}""").to_polygons()
+    assert lam.trapped_criticality() == 0
+    lam.polygons[0] = (FloatWrapper(0.0, 2), FloatWrapper(0.5, 2))
+    assert lam.trapped_criticality() == 1
+    joined = GapLamination._joined([lam, lam], 2)
+    assert joined.trapped_criticality() == 2
+    joined.polygons.pop()
+    assert joined.trapped_criticality() == 1
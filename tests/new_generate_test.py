@@ -27,6 +27,7 @@ from manim_lamination_builder.custom_json import custom_dump, custom_parse
 from manim_lamination_builder.lamination import GapLamination, LeafLamination
 from manim_lamination_builder.main import Main
 from manim_lamination_builder.new_generate import (
+    _compatibility,
     _sibling_collections_of_leaf,
     _sibling_collections_of_leaf_in_existing,
     pre_image_dictionary,
@@ -139,6 +140,38 @@ def test_issolated_collections2():
 # test_issolated_collections2()
 
 
+def test_collections_in_existing_leave_it_unchanged():
+    existing = LeafLamination(
+        leafs={
+            Chord(
+                NaryFraction.from_string(2, "_001"), NaryFraction.from_string(2, "_010")
+            )
+        },
+        points=[],
+        degree=2,
+    )
+    before = set(existing.leafs)
+    l = Chord(NaryFraction.from_string(2, "_010"), NaryFraction.from_string(2, "_100"))
+    collections = _sibling_collections_of_leaf_in_existing(l, existing, [])
+    assert existing.leafs == before
+    assert existing.unlinked()
+    assert len(collections) > 0
+    for collection in collections:
+        assert collection.unlinked()
+        assert collection.leafs >= before
+        assert LeafLamination(leafs=collection.leafs, points=[], degree=2).unlinked()
+        assert all(sigma(lp) == l for lp in collection.leafs - before)
+
+    # pushing a crossing leaf and popping it restores the crossing index
+    crossing = Chord(
+        NaryFraction.from_string(2, "_0011"), NaryFraction.from_string(2, "_01")
+    )
+    existing.push_leaf(crossing)
+    assert not existing.unlinked()
+    existing.pop_leaf()
+    assert existing.unlinked() and existing.leafs == before
+
+
 def test_preimage_dictionary():
     start = parse_lamination(
         """
@@ -154,6 +187,21 @@ def test_preimage_dictionary():
     assert hist == [0, 0, 1]
 
 
+def test_compatibility_matches_coexists():
+    start = parse_lamination(
+        """{polygons:[['_100','_010','_001'],['1_100','1_010','0_001']],degree:2}"""
+    ).to_polygons()
+    options = [
+        sibling_portraits([p.pre_images() for p in poly]) for poly in start.polygons
+    ]
+    compatible = _compatibility(options)
+    for k, a in enumerate(options[0]):
+        for l, b in enumerate(options[1]):
+            expected = a.coexists(b)
+            assert bool(compatible[0][k][1] >> l & 1) == expected
+            assert bool(compatible[1][l][0] >> k & 1) == expected
+
+
 def test_new_sibling_portraits():
     start = parse_lamination(
         """{polygons:[['_100','_010','_001']],degree:3}"""
@@ -4,6 +4,7 @@ from math import gcd
 
 from manim_lamination_builder import PeriodicOrbit, sigma
 from manim_lamination_builder.points import NaryFraction
+from manim_lamination_builder.visual_settings import get_color
 
 
 def test_deployment_sequence():
@@ -104,3 +105,9 @@ def test_goldberg_random_is_correct():
 
 def test_orbits_zero():
     assert len(PeriodicOrbit(NaryFraction.from_string(2, "0")).spacial_orbit) == 1
+
+
+def test_orbits_keep_style():
+    point = NaryFraction.from_string(2, "_001").restyled(point_color=get_color(3))
+    orbit = PeriodicOrbit(point)
+    assert all(p.visual_settings is point.visual_settings for p in orbit.spacial_orbit)
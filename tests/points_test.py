@@ -1,6 +1,10 @@
+import pytest
 from numpy.random import rand
+from pydantic import ValidationError
 
+from manim_lamination_builder.custom_json import parse_lamination
 from manim_lamination_builder.points import *
+from manim_lamination_builder.visual_settings import get_color
 
 
 def test_original_point_operations():
@@ -83,3 +87,167 @@ def test_add():
 
 
 test_add()
+
+
+def test_exact_equality():
+    # distinct rationals closer together than any float bucket
+    a = NaryFraction.from_string(2, "0" * 30 + "1")
+    b = NaryFraction.from_string(2, "0" * 31 + "1")
+    assert a != b
+    assert len({a, b}) == 2
+    assert b < a
+    # the same rational in different degrees
+    assert NaryFraction.from_string(2, "1") == NaryFraction.from_string(4, "2")
+    assert hash(NaryFraction.from_string(2, "_01")) == hash(
+        NaryFraction.from_string(4, "_1")
+    )
+    # other kinds of angles fall back to comparing floats, and hash consistently
+    x, f = NaryFraction.from_string(2, "_001"), FloatWrapper(1 / 7, 2)
+    assert x == f and f == x
+    assert hash(x) == hash(f) and x.bucket_hash == hash(x)
+    assert len({x, f}) == 1
+    assert {x: 1}.get(f) == 1
+    assert NaryFraction.from_string(2, "0") == 0
+
+
+def test_interned():
+    intern_table.clear()
+    a = NaryFraction.from_string(2, "_001")
+    assert intern_table.misses == 1
+    assert NaryFraction.from_string(2, "0_010") is a
+    assert a.after_sigma().after_sigma().after_sigma() is a
+    assert intern_table.hits >= 2
+    styled = a.restyled(point_color=get_color(1))
+    assert styled.after_sigma() is not a.after_sigma()
+    assert styled.after_sigma() == a.after_sigma()
+
+
+def test_interned_digits_are_validated():
+    # "02" has the value of "1", which is already interned
+    NaryFraction.from_string(2, "1")
+    with pytest.raises(ValidationError):
+        NaryFraction.from_string(2, "02")
+    with pytest.raises(ValidationError):
+        parse_lamination('{degree:2, polygons:[["02","_01"]]}')
+
+
+def test_interned_points_are_frozen():
+    shared = NaryFraction.from_string(2, "_001")
+    with pytest.raises(ValidationError):
+        shared.visual_settings = shared.visual_settings.restyled(
+            point_color=get_color(1)
+        )
+    green = shared.restyled(point_color=get_color(1))
+    assert NaryFraction.from_string(2, "_001") is shared
+    assert NaryFraction.from_string(2, "_100").after_sigma() is shared
+    assert shared.visual_settings.point_color != green.visual_settings.point_color
+
+
+def test_intern_table_is_bounded():
+    table = InternTable(maxsize=2)
+    for i in range(3):
+        table.add(i, NaryFraction.from_string(2, "1"))
+    assert len(table) == 2
+    assert table.get(0) is None
+    assert table.get(2) is not None
+
+
+def test_angle_array():
+    points = [
+        NaryFraction.from_string(3, string) for string in ["_0", "1", "_01", "2_012"]
+    ] + [FloatWrapper(0.7, 3)]
+    array = AngleArray.from_angles(points, 3)
+    assert list(array.exact()) == [True, True, True, True, False]
+    assert sigma(array).to_angles() == [sigma(p) for p in points]
+    pre_images = array.pre_images()
+    assert pre_images.shape == (5, 3)
+    for i, p in enumerate(points):
+        assert pre_images[i].to_angles() == p.pre_images()
+    assert list(array.sorted().to_float()) == sorted(p.to_float() for p in points)
+    assert array.to_cartesian().shape == (5, 3)
+
+
+def test_angle_array_keeps_large_ratios():
+    # 2**70 - 1 does not fit in int64, 2**61 - 1 does but its pre-images do not
+    points = [
+        NaryFraction.from_string(2, "_" + "0" * 69 + "1"),
+        NaryFraction.from_string(2, "_" + "0" * 60 + "1"),
+    ]
+    array = AngleArray.from_angles(points, 2)
+    assert list(array.exact()) == [True, True]
+    assert array.to_angles() == points
+    assert sigma(array).to_angles() == [sigma(p) for p in points]
+    pre_images = array.pre_images()
+    for i, p in enumerate(points):
+        assert pre_images[i].to_angles() == p.pre_images()
+    assert all(isinstance(p, NaryFraction) for p in pre_images[1].to_angles())
+
+
+def test_from_ratio():
+    for string in ["_0", "1", "_001", "0_001", "12_0102", "_21"]:
+        point = NaryFraction.from_string(3, string)
+        ratio = NaryFraction.from_ratio(*point._ratio, 3)
+        assert (ratio.exact, ratio.repeating) == (point.exact, point.repeating)
+
+
+def test_long_period_sigma():
+    point = NaryFraction.from_string(2, "_" + "0" * 24 + "1")
+    assert point.period() == 25 and point.pre_period() == 0
+    image = point
+    for _ in range(25):
+        image = image.after_sigma()
+    assert image is point
+    pre_image = NaryFraction.from_ratio(5, 37, 3)
+    assert pre_image.model_dump()["repeating"] == pre_image.repeating
+    assert all(p.after_sigma() == pre_image for p in pre_image.pre_images())
+
+
+def test_visual_settings_are_shared():
+    point = FloatWrapper(0.1, 3).restyled(point_color=get_color(2))
+    assert point.after_sigma().visual_settings is point.visual_settings
+    assert all(p.visual_settings is point.visual_settings for p in point.pre_images())
+    other = NaryFraction.from_string(3, "_01").restyled(point_color=get_color(2))
+    assert other.visual_settings is point.visual_settings
+    assert sigma(FloatWrapper(0.1, 3)).visual_settings is DEFAULT_VISUAL_SETTINGS
+
+
+def test_sort_key():
+    # the two differ by less than floating point precision
+    a = NaryFraction.from_string(2, "_01")
+    b = NaryFraction.from_ratio(2**62 // 3, 2**62, 2)
+    assert a.to_float() == b.to_float()
+    assert b.sort_key < a.sort_key and b < a
+    assert sorted([FloatWrapper(0.5, 2), a, b], key=lambda p: p.sort_key) == [b, a, 0.5]
+
+
+def test_from_floats():
+    strings = ["_001", "_010", "0_001", "001", "_01", "1_0110", "_00001"]
+    points = [NaryFraction.from_string(3, string) for string in strings]
+    assert NaryFraction.from_floats([p.to_float() for p in points], 3) == points
+    assert NaryFraction.from_float(0.3, 2) == NaryFraction.from_string(2, "0_1001")
+    near_third = NaryFraction.from_floats([1 / 3 + 1e-12], 2, tolerance=1e-9)[0]
+    assert near_third == NaryFraction.from_string(2, "_01")
+    (limited,) = NaryFraction.from_floats([0.1], 2, max_period=2, max_pre_period=3)
+    assert limited.pre_period() <= 3 and len(limited.repeating) <= 2
+
+
+def test_orbit():
+    point = NaryFraction.from_string(2, "10_011")
+    point_orbit = orbit(point)
+    assert point_orbit is orbit(NaryFraction.from_string(2, "10_011"))
+    assert len(point_orbit.tail) == 2 and len(point_orbit.cycle) == 3
+    image = point
+    for k in range(10):
+        assert point_orbit.iterate(k) == image
+        image = image.after_sigma()
+    assert point_orbit.index(NaryFraction.from_string(2, "_110")) == 3
+    assert in_forward_orbit(NaryFraction.from_string(2, "_101"), point)
+    assert not in_forward_orbit(point, NaryFraction.from_string(2, "_101"))
+    assert list(orbit(NaryFraction.from_string(3, "12"))) == [
+        NaryFraction.from_string(3, "12"),
+        NaryFraction.from_string(3, "2"),
+        NaryFraction.from_string(3, "_0"),
+    ]
+    styled = point.restyled(point_color=get_color(2))
+    assert all(p.visual_settings is styled.visual_settings for p in orbit(styled))
+    assert list(orbit(styled)) == list(point_orbit)
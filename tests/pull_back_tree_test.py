@@ -8,7 +8,11 @@ from manim.utils.file_ops import config
 
 from manim_lamination_builder import PullBackTree, TreeRender, parse_lamination
 from manim_lamination_builder.constructions import pollygons_are_one_to_one
-from manim_lamination_builder.custom_json import custom_dump, custom_parse
+from manim_lamination_builder.custom_json import (
+    custom_dump,
+    custom_parse,
+    read_file_to_laminations,
+)
 
 
 def test_rabbit_tree():
@@ -40,6 +44,33 @@ def test_rabbit_tree_extend():
     assert len(list_of_lists[4]) == 4
 
 
+def test_parallel_tree_matches_serial():
+    start = parse_lamination(
+        """{polygons:[['_100','_010','_001']],degree:3}"""
+    ).to_leafs()
+    serial = PullBackTree.build(start, 2).flatten()
+    assert PullBackTree.build(start, 2, workers=2).flatten() == serial
+    extended = PullBackTree.build(start, 1).extend_by_one_level(workers=2)
+    assert extended.flatten() == serial
+
+
+def test_streamed_generation_matches_tree(tmp_path):
+    start = parse_lamination(
+        """{polygons:[['_100','_010','_001']],degree:3}"""
+    ).to_leafs()
+    flattened = PullBackTree.build(start, 2).flatten()
+    assert list(PullBackTree.iter_generation(start, 2)) == flattened[2]
+    generations = [generation for generation, _ in PullBackTree.walk(start, 2)]
+    assert [generations.count(n) for n in range(3)] == list(map(len, flattened))
+
+    path = str(tmp_path / "generation.json")
+    assert PullBackTree.write_generation(start, 2, path) == len(flattened[2])
+    read = read_file_to_laminations(path)
+    # lamination equality does not compare the points
+    assert read == flattened[2]
+    assert [lam.points for lam in read] == [lam.points for lam in flattened[2]]
+
+
 def test_restore_rabbit_tree():
     start = parse_lamination(
         """{polygons:[['_100','_010','_001']],degree:2}"""
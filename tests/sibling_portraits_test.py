@@ -39,5 +39,20 @@ def test_all_portraits():
             assert len(options) == fussCatalan(d - 1, n + 1)
 
 
+def test_pull_backs_are_canonical():
+    "next_pull_back skips validation, so check it agrees with the validated form"
+    for d in range(2, 4):
+        shape = unicritical_polygon(d, 3)
+        lamination = GapLamination(polygons=[shape], points=[], degree=d)
+        for option in next_pull_back(lamination):
+            validated = GapLamination(
+                polygons=option.polygons, points=option.points, degree=d
+            )
+            assert option.polygons == validated.polygons
+            assert option.unlinked()
+            # added up from the pieces it was joined from
+            assert option.trapped_criticality() == validated.trapped_criticality()
+
+
 if __name__ == "__main__":
     pass